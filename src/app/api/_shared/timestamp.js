@@ -0,0 +1,23 @@
+// Cached ISO-8601 timestamp for response envelopes, shared by the app
+// routes (through lib/timestamp) and the plain Node handlers beside it.
+//
+// Formatting a Date on every response is wasted work when many responses
+// land in the same instant; the string is re-rendered at most once per
+// TIMESTAMP_RESOLUTION_MS and read lazily, so no background timer is needed.
+
+const TIMESTAMP_RESOLUTION_MS = 100;
+
+let cachedAt = -Infinity;
+let cachedIso = '';
+
+/** @returns {string} */
+function isoTimestamp() {
+  const now = Date.now();
+  if (now - cachedAt >= TIMESTAMP_RESOLUTION_MS) {
+    cachedAt = now;
+    cachedIso = new Date(now).toISOString();
+  }
+  return cachedIso;
+}
+
+module.exports = { isoTimestamp };
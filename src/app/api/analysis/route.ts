@@ -1,87 +1,166 @@
 import { NextRequest, NextResponse } from 'next/server';
+import {
+  type IndexedGraph,
+  DistanceHeap,
+  bfs,
+  buildGraph,
+  connectedComponents,
+  degree,
+  dijkstra,
+  edgeColumns,
+  getGraph,
+  getIndexedGraph,
+  nodeColumn,
+  readNetworkRequest,
+  shortestPathSummary,
+  structuralSummary,
+  toUndirected,
+  transitivity,
+  triangleCounts
+} from '@/lib/graph';
+import { louvain } from '@/lib/community';
+import { preEncodedJson } from '@/lib/responses';
+import { isoTimestamp } from '@/lib/timestamp';
+
+const STRUCTURAL_PATH_SOURCES = 1000;
+
+// Static catalog served by GET; built once per process, not per request
+const ANALYSIS_CATALOG = [
+  {
+    id: 'community_detection',
+    name: 'Community Detection',
+    description: 'Identify densely connected groups of nodes',
+    algorithms: [
+      { id: 'louvain', name: 'Louvain Algorithm', complexity: 'O(n log n)' },
+      { id: 'girvan_newman', name: 'Girvan-Newman Algorithm', complexity: 'O(m²n)' },
+      { id: 'label_propagation', name: 'Label Propagation', complexity: 'O(m)' }
+    ]
+  },
+  {
+    id: 'path_analysis',
+    name: 'Path Analysis',
+    description: 'Analyze shortest paths and connectivity',
+    algorithms: [
+      { id: 'shortest_paths', name: 'All Pairs Shortest Paths', complexity: 'O(n³)' },
+      { id: 'diameter', name: 'Network Diameter', complexity: 'O(n³)' },
+      { id: 'eccentricity', name: 'Node Eccentricity', complexity: 'O(n²)' }
+    ]
+  },
+  {
+    id: 'clustering',
+    name: 'Clustering Analysis',
+    description: 'Measure local clustering properties',
+    algorithms: [
+      { id: 'clustering_coefficient', name: 'Clustering Coefficient', complexity: 'O(n²)' },
+      { id: 'transitivity', name: 'Transitivity', complexity: 'O(n³)' },
+      { id: 'triangles', name: 'Triangle Count', complexity: 'O(n³)' }
+    ]
+  },
+  {
+    id: 'structural_properties',
+    name: 'Structural Properties',
+    description: 'Analyze overall network structure',
+    algorithms: [
+      { id: 'density', name: 'Network Density', complexity: 'O(1)' },
+      { id: 'assortativity', name: 'Assortativity', complexity: 'O(m)' },
+      { id: 'modularity', name: 'Modularity', complexity: 'O(m)' }
+    ]
+  }
+];
+
+// Handler for each analysis type id in the catalog
+const ANALYSES = new Map<string, (graph: IndexedGraph, algorithm: string, options: any) => any>([
+  ['community_detection', performCommunityDetection],
+  ['path_analysis', performPathAnalysis],
+  ['clustering', performClusteringAnalysis],
+  ['structural_properties', performStructuralAnalysis]
+]);
 
 export async function POST(request: NextRequest) {
+  const startTime = performance.now();
   try {
-    const body = await request.json();
-    const { network, analysis, algorithm, options = {} } = body;
-
-    if (!network || !network.nodes || !Array.isArray(network.nodes)) {
+    // Binary edge lists carry the analysis parameters in the query string:
+    // ?analysis=...&algorithm=...&directed=true&options={...}
+    const { body, binary, error } = await readNetworkRequest(request);
+    if (error) {
       return NextResponse.json({
         success: false,
-        error: 'Network must have a nodes array',
-        timestamp: new Date().toISOString()
+        error,
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
+    const { network, analysis, algorithm, options = {} } = body;
 
-    if (!network.edges || !Array.isArray(network.edges)) {
+    // The request is checked fully before any graph is built or looked up
+    if (!analysis) {
       return NextResponse.json({
         success: false,
-        error: 'Network must have an edges array',
-        timestamp: new Date().toISOString()
+        error: 'Analysis type must be specified',
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
 
-    if (!analysis) {
+    const perform = ANALYSES.get(String(analysis).toLowerCase());
+    if (!perform) {
       return NextResponse.json({
         success: false,
-        error: 'Analysis type must be specified',
-        timestamp: new Date().toISOString()
+        error: `Unknown analysis type: ${analysis}`,
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
 
-    // Build adjacency list
-    const adjacencyList: Record<string, string[]> = {};
-    network.nodes.forEach((node: any) => {
-      adjacencyList[node.id] = [];
-    });
-
-    network.edges.forEach((edge: any) => {
-      if (adjacencyList[edge.source] && adjacencyList[edge.target]) {
-        adjacencyList[edge.source].push(edge.target);
-        if (!network.directed) {
-          adjacencyList[edge.target].push(edge.source);
-        }
+    let graph: IndexedGraph;
+    let edgeCount: number;
+    if (binary !== undefined) {
+      if (!binary) {
+        return NextResponse.json({
+          success: false,
+          error: 'Malformed binary network payload',
+          timestamp: isoTimestamp()
+        }, { status: 400 });
+      }
+      graph = getIndexedGraph(binary.nodeCount, binary.source, binary.target, binary.weight, body.directed);
+      edgeCount = binary.source.length;
+    } else {
+      const nodeIds = network ? nodeColumn(network.nodes) : null;
+      if (!nodeIds) {
+        return NextResponse.json({
+          success: false,
+          error: 'Network must have a nodes array',
+          timestamp: isoTimestamp()
+        }, { status: 400 });
       }
-    });
 
-    // Perform analysis based on type
-    let results;
-    switch (analysis.toLowerCase()) {
-      case 'community_detection':
-        results = performCommunityDetection(network.nodes, adjacencyList, algorithm, options);
-        break;
-      case 'path_analysis':
-        results = performPathAnalysis(network.nodes, adjacencyList, algorithm, options);
-        break;
-      case 'clustering':
-        results = performClusteringAnalysis(network.nodes, adjacencyList, algorithm, options);
-        break;
-      case 'structural_properties':
-        results = performStructuralAnalysis(network.nodes, adjacencyList, algorithm, options);
-        break;
-      default:
+      const edges = edgeColumns(network.edges);
+      if (!edges) {
         return NextResponse.json({
           success: false,
-          error: `Unknown analysis type: ${analysis}`,
-          timestamp: new Date().toISOString()
+          error: 'Network must have an edges array',
+          timestamp: isoTimestamp()
         }, { status: 400 });
+      }
+
+      graph = getGraph(nodeIds, edges, !!network.directed);
+      edgeCount = edges.source.length;
     }
 
+    const results = perform(graph, algorithm, options);
+
     return NextResponse.json({
       success: true,
       analysis,
       algorithm: algorithm || 'default',
       results,
       metadata: {
-        nodeCount: network.nodes.length,
-        edgeCount: network.edges.length,
-        computationTime: 150,
+        nodeCount: graph.nodeIds.length,
+        edgeCount,
+        computationTime: Math.round(performance.now() - startTime),
         analysis: analysis,
         algorithm: algorithm,
         parameters: options,
         statistics: results.statistics || {}
       },
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     console.error('Analysis computation error:', error);
@@ -89,136 +168,150 @@ export async function POST(request: NextRequest) {
       success: false,
       error: 'Internal server error',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
 
+const analysisCatalogResponse = preEncodedJson({
+  success: true,
+  analyses: ANALYSIS_CATALOG,
+  total: ANALYSIS_CATALOG.length
+});
+
 export async function GET() {
   try {
-    const analyses = [
-      {
-        id: 'community_detection',
-        name: 'Community Detection',
-        description: 'Identify densely connected groups of nodes',
-        algorithms: [
-          { id: 'louvain', name: 'Louvain Algorithm', complexity: 'O(n log n)' },
-          { id: 'girvan_newman', name: 'Girvan-Newman Algorithm', complexity: 'O(m²n)' },
-          { id: 'label_propagation', name: 'Label Propagation', complexity: 'O(m)' }
-        ]
-      },
-      {
-        id: 'path_analysis',
-        name: 'Path Analysis',
-        description: 'Analyze shortest paths and connectivity',
-        algorithms: [
-          { id: 'shortest_paths', name: 'All Pairs Shortest Paths', complexity: 'O(n³)' },
-          { id: 'diameter', name: 'Network Diameter', complexity: 'O(n³)' },
-          { id: 'eccentricity', name: 'Node Eccentricity', complexity: 'O(n²)' }
-        ]
-      },
-      {
-        id: 'clustering',
-        name: 'Clustering Analysis',
-        description: 'Measure local clustering properties',
-        algorithms: [
-          { id: 'clustering_coefficient', name: 'Clustering Coefficient', complexity: 'O(n²)' },
-          { id: 'transitivity', name: 'Transitivity', complexity: 'O(n³)' },
-          { id: 'triangles', name: 'Triangle Count', complexity: 'O(n³)' }
-        ]
-      },
-      {
-        id: 'structural_properties',
-        name: 'Structural Properties',
-        description: 'Analyze overall network structure',
-        algorithms: [
-          { id: 'density', name: 'Network Density', complexity: 'O(1)' },
-          { id: 'assortativity', name: 'Assortativity', complexity: 'O(m)' },
-          { id: 'modularity', name: 'Modularity', complexity: 'O(m)' }
-        ]
-      }
-    ];
-
-    return NextResponse.json({
-      success: true,
-      analyses,
-      total: analyses.length,
-      timestamp: new Date().toISOString()
-    });
+    return analysisCatalogResponse();
   } catch (error) {
     console.error('Analysis algorithms API error:', error);
     return NextResponse.json({
       success: false,
       error: 'Failed to fetch available analysis algorithms',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
 
 // Analysis functions
-function performCommunityDetection(nodes: any[], adjacencyList: Record<string, string[]>, algorithm: string, options: any) {
-  // Simplified community detection
-  const communities = nodes.map(node => ({
-    nodeId: node.id,
-    community: Math.floor(Math.random() * 3),
-    communitySize: Math.floor(Math.random() * 10) + 1
+function performCommunityDetection(graph: IndexedGraph, algorithm: string, options: any) {
+  const result = louvain(graph, {
+    resolution: options.resolution,
+    maxLevels: options.maxLevels
+  });
+
+  const groups: string[][] = Array.from({ length: result.communityCount }, () => []);
+  graph.nodeIds.forEach((nodeId, i) => {
+    groups[result.membership[i]].push(nodeId);
+  });
+
+  const communities = graph.nodeIds.map((nodeId, i) => ({
+    nodeId,
+    community: result.membership[i],
+    communitySize: groups[result.membership[i]].length
   }));
 
   return {
     communities,
-    communityGroups: [[nodes[0]?.id], [nodes[1]?.id], [nodes[2]?.id]].filter(g => g[0]),
+    communityGroups: groups,
     statistics: {
-      numCommunities: 3,
-      modularity: Math.random(),
-      iterations: 10
+      numCommunities: result.communityCount,
+      modularity: result.modularity,
+      iterations: result.levels
     }
   };
 }
 
-function performPathAnalysis(nodes: any[], adjacencyList: Record<string, string[]>, algorithm: string, options: any) {
-  // Simplified path analysis
-  const shortestPaths = nodes.map(node => ({
-    nodeId: node.id,
-    shortestPaths: {},
-    avgDistance: Math.random() * 5
-  }));
+function performPathAnalysis(graph: IndexedGraph, algorithm: string, options: any) {
+  const n = graph.nodeIds.length;
+  const weighted = options.weighted === true && graph.weights !== null;
+  const summary = shortestPathSummary(graph, weighted);
+
+  // Per-target distances are only materialized when explicitly requested
+  let dist: Float64Array | null = null;
+  let queue: Int32Array | null = null;
+  let heap: DistanceHeap | null = null;
+  if (options.includePaths) {
+    dist = new Float64Array(n);
+    queue = new Int32Array(n);
+    heap = weighted ? new DistanceHeap(dist) : null;
+  }
+
+  const shortestPaths = graph.nodeIds.map((nodeId, s) => {
+    const paths: Record<string, number> = {};
+    if (dist && queue) {
+      if (heap) {
+        dijkstra(graph, s, dist, heap);
+      } else {
+        bfs(graph, s, dist, queue);
+      }
+      for (let t = 0; t < n; t++) {
+        if (t !== s && dist[t] !== Infinity) paths[graph.nodeIds[t]] = dist[t];
+      }
+    }
+
+    return {
+      nodeId,
+      shortestPaths: paths,
+      avgDistance: summary.reached[s] > 0 ? summary.distanceSum[s] / summary.reached[s] : 0,
+      eccentricity: summary.eccentricity[s]
+    };
+  });
 
   return {
     shortestPaths,
     statistics: {
-      avgPathLength: Math.random() * 3,
-      maxDistance: Math.floor(Math.random() * 10) + 1,
-      connectedPairs: Math.floor(nodes.length * (nodes.length - 1) / 2)
+      avgPathLength: summary.averagePathLength,
+      maxDistance: summary.diameter,
+      radius: summary.radius,
+      connectedPairs: graph.directed ? summary.reachablePairs : summary.reachablePairs / 2,
+      weighted
     }
   };
 }
 
-function performClusteringAnalysis(nodes: any[], adjacencyList: Record<string, string[]>, algorithm: string, options: any) {
-  // Simplified clustering analysis
-  const clusteringCoefficients = nodes.map(node => ({
-    nodeId: node.id,
-    clusteringCoefficient: Math.random(),
-    degree: adjacencyList[node.id].length,
-    triangles: Math.floor(Math.random() * 5),
-    possibleTriangles: Math.floor(Math.random() * 10)
-  }));
+function performClusteringAnalysis(graph: IndexedGraph, algorithm: string, options: any) {
+  const undirected = toUndirected(graph);
+  const triangles = triangleCounts(undirected);
+
+  let sumCoefficient = 0;
+  let maxCoefficient = 0;
+  const clusteringCoefficients = undirected.nodeIds.map((nodeId, i) => {
+    const d = degree(undirected, i);
+    const possibleTriangles = d * (d - 1) / 2;
+    const clusteringCoefficient = possibleTriangles > 0 ? triangles.perNode[i] / possibleTriangles : 0;
+    sumCoefficient += clusteringCoefficient;
+    if (clusteringCoefficient > maxCoefficient) maxCoefficient = clusteringCoefficient;
+    return {
+      nodeId,
+      clusteringCoefficient,
+      degree: d,
+      triangles: triangles.perNode[i],
+      possibleTriangles
+    };
+  });
 
   return {
     clusteringCoefficients,
     statistics: {
-      avgClusteringCoefficient: Math.random(),
-      maxClusteringCoefficient: Math.random(),
-      totalTriangles: Math.floor(Math.random() * 20)
+      avgClusteringCoefficient: clusteringCoefficients.length > 0 ? sumCoefficient / clusteringCoefficients.length : 0,
+      maxClusteringCoefficient: maxCoefficient,
+      totalTriangles: triangles.total,
+      transitivity: transitivity(undirected, triangles)
     }
   };
 }
 
-function performStructuralAnalysis(nodes: any[], adjacencyList: Record<string, string[]>, algorithm: string, options: any) {
-  // Simplified structural analysis
-  const totalEdges = Object.values(adjacencyList).reduce((sum, neighbors) => sum + neighbors.length, 0) / 2;
-  const maxPossibleEdges = nodes.length * (nodes.length - 1) / 2;
+function performStructuralAnalysis(graph: IndexedGraph, algorithm: string, options: any) {
+  const n = graph.nodeIds.length;
+  const totalEdges = graph.edgeCount;
+  const maxPossibleEdges = graph.directed ? n * (n - 1) : n * (n - 1) / 2;
   const density = maxPossibleEdges > 0 ? totalEdges / maxPossibleEdges : 0;
+  // Exact all-pairs sweeps are O(V·E); large graphs sample sources unless
+  // the caller asks for exact values
+  const paths = shortestPathSummary(graph, false, options.exactPaths ? Infinity : STRUCTURAL_PATH_SOURCES);
+  const mixing = structuralSummary(graph);
+  const components = connectedComponents(graph);
 
   return {
     density,
@@ -227,7 +320,33 @@ function performStructuralAnalysis(nodes: any[], adjacencyList: Record<string, s
       maxPossibleEdges,
       density,
       sparsity: 1 - density,
-      avgDegree: totalEdges * 2 / nodes.length
+      avgDegree: n > 0 ? graph.indices.length / n : 0,
+      averagePathLength: paths.averagePathLength,
+      diameter: paths.diameter,
+      pathSources: paths.sources,
+      connected: components.count <= 1,
+      componentCount: components.count,
+      largestComponentSize: components.largest,
+      transitivity: mixing.transitivity,
+      assortativity: mixing.assortativity
     }
   };
-}
\ No newline at end of file
+}
+
+// Exercise every kernel once on a toy graph when the route module loads, so
+// the first real request doesn't pay for lazy compilation and cold inline
+// caches. The toy graph bypasses the shared graph cache.
+function warmUpKernels() {
+  const ids = ['a', 'b', 'c', 'd'];
+  const edges = { source: ['a', 'b', 'c', 'c'], target: ['b', 'c', 'a', 'd'], weight: [1, 2, 1, 3] };
+  for (const directed of [false, true]) {
+    const graph = buildGraph(ids, edges, directed);
+    performCommunityDetection(graph, 'louvain', {});
+    performPathAnalysis(graph, 'default', { weighted: true, includePaths: true });
+    performPathAnalysis(graph, 'default', {});
+    performClusteringAnalysis(graph, 'default', {});
+    performStructuralAnalysis(graph, 'default', {});
+  }
+}
+
+warmUpKernels();
@@ -3,12 +3,21 @@
  * Implements persistent data storage and retrieval
  */
 
+import { randomUUID } from 'crypto';
+import { isoTimestamp } from '../_shared/timestamp';
+
 // In-memory database simulation (for Vercel serverless)
 // In production, this would connect to PostgreSQL, MongoDB, or another database
 let networks = new Map();
 let analyses = new Map();
 let users = new Map();
 
+// Secondary indexes (owner id -> Set of record ids), so per-user and
+// per-network lookups and cascading deletes don't scan every record
+const networksByUser = new Map();
+const analysesByUser = new Map();
+const analysesByNetwork = new Map();
+
 export default function handler(req, res) {
   // Enable CORS
   res.setHeader('Access-Control-Allow-Origin', '*');
@@ -39,7 +48,7 @@ export default function handler(req, res) {
           return res.status(400).json({
             success: false,
             error: 'Invalid type parameter',
-            timestamp: new Date().toISOString()
+            timestamp: isoTimestamp()
           });
       }
     }
@@ -58,7 +67,7 @@ export default function handler(req, res) {
           return res.status(400).json({
             success: false,
             error: 'Invalid type parameter',
-            timestamp: new Date().toISOString()
+            timestamp: isoTimestamp()
           });
       }
     }
@@ -77,7 +86,7 @@ export default function handler(req, res) {
           return res.status(400).json({
             success: false,
             error: 'Invalid type parameter',
-            timestamp: new Date().toISOString()
+            timestamp: isoTimestamp()
           });
       }
     }
@@ -96,7 +105,7 @@ export default function handler(req, res) {
           return res.status(400).json({
             success: false,
             error: 'Invalid type parameter',
-            timestamp: new Date().toISOString()
+            timestamp: isoTimestamp()
           });
       }
     }
@@ -104,7 +113,7 @@ export default function handler(req, res) {
     res.status(405).json({
       success: false,
       error: 'Method not allowed',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
 
   } catch (error) {
@@ -113,7 +122,7 @@ export default function handler(req, res) {
       success: false,
       error: 'Internal server error',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -122,8 +131,7 @@ export default function handler(req, res) {
 
 function getNetworks(userId, res) {
   try {
-    const userNetworks = Array.from(networks.values())
-      .filter(network => !userId || network.userId === userId)
+    const userNetworks = (userId ? lookup(networksByUser, userId, networks) : Array.from(networks.values()))
       .map(network => ({
         id: network.id,
         name: network.name,
@@ -139,14 +147,14 @@ function getNetworks(userId, res) {
       success: true,
       networks: userNetworks,
       total: userNetworks.length,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to fetch networks',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -157,7 +165,7 @@ function getNetwork(id, res) {
       return res.status(400).json({
         success: false,
         error: 'Network ID is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -166,21 +174,21 @@ function getNetwork(id, res) {
       return res.status(404).json({
         success: false,
         error: 'Network not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     res.status(200).json({
       success: true,
       network,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to fetch network',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -193,11 +201,12 @@ function createNetwork(data, res) {
       return res.status(400).json({
         success: false,
         error: 'Network name and nodes are required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     const networkId = generateId();
+    const now = new Date().toISOString();
     const network = {
       id: networkId,
       name,
@@ -206,24 +215,24 @@ function createNetwork(data, res) {
       edges: edges || [],
       userId: userId || 'anonymous',
       metadata: metadata || {},
-      createdAt: new Date().toISOString(),
-      updatedAt: new Date().toISOString()
+      createdAt: now,
+      updatedAt: now
     };
 
-    networks.set(networkId, network);
+    putNetwork(network);
 
     res.status(201).json({
       success: true,
       network,
       message: 'Network created successfully',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to create network',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -234,7 +243,7 @@ function updateNetwork(id, data, res) {
       return res.status(400).json({
         success: false,
         error: 'Network ID is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -243,7 +252,7 @@ function updateNetwork(id, data, res) {
       return res.status(404).json({
         success: false,
         error: 'Network not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -255,20 +264,20 @@ function updateNetwork(id, data, res) {
       updatedAt: new Date().toISOString()
     };
 
-    networks.set(id, updatedNetwork);
+    putNetwork(updatedNetwork);
 
     res.status(200).json({
       success: true,
       network: updatedNetwork,
       message: 'Network updated successfully',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to update network',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -279,7 +288,7 @@ function deleteNetwork(id, res) {
       return res.status(400).json({
         success: false,
         error: 'Network ID is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -288,29 +297,28 @@ function deleteNetwork(id, res) {
       return res.status(404).json({
         success: false,
         error: 'Network not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
-    networks.delete(id);
+    removeNetwork(network);
 
     // Also delete related analyses
-    const relatedAnalyses = Array.from(analyses.values())
-      .filter(analysis => analysis.networkId === id);
-    relatedAnalyses.forEach(analysis => analyses.delete(analysis.id));
+    const relatedAnalyses = lookup(analysesByNetwork, id, analyses);
+    relatedAnalyses.forEach(removeAnalysis);
 
     res.status(200).json({
       success: true,
       message: 'Network deleted successfully',
       deletedAnalyses: relatedAnalyses.length,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to delete network',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -319,8 +327,7 @@ function deleteNetwork(id, res) {
 
 function getAnalyses(userId, res) {
   try {
-    const userAnalyses = Array.from(analyses.values())
-      .filter(analysis => !userId || analysis.userId === userId)
+    const userAnalyses = (userId ? lookup(analysesByUser, userId, analyses) : Array.from(analyses.values()))
       .map(analysis => ({
         id: analysis.id,
         networkId: analysis.networkId,
@@ -336,14 +343,14 @@ function getAnalyses(userId, res) {
       success: true,
       analyses: userAnalyses,
       total: userAnalyses.length,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to fetch analyses',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -354,7 +361,7 @@ function getAnalysis(id, res) {
       return res.status(400).json({
         success: false,
         error: 'Analysis ID is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -363,21 +370,21 @@ function getAnalysis(id, res) {
       return res.status(404).json({
         success: false,
         error: 'Analysis not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     res.status(200).json({
       success: true,
       analysis,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to fetch analysis',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -390,7 +397,7 @@ function createAnalysis(data, res) {
       return res.status(400).json({
         success: false,
         error: 'Network ID and analysis type are required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -399,11 +406,12 @@ function createAnalysis(data, res) {
       return res.status(404).json({
         success: false,
         error: 'Network not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     const analysisId = generateId();
+    const now = new Date().toISOString();
     const analysis = {
       id: analysisId,
       networkId,
@@ -413,24 +421,24 @@ function createAnalysis(data, res) {
       results: results || null,
       status: 'completed',
       userId: userId || 'anonymous',
-      createdAt: new Date().toISOString(),
-      updatedAt: new Date().toISOString()
+      createdAt: now,
+      updatedAt: now
     };
 
-    analyses.set(analysisId, analysis);
+    putAnalysis(analysis);
 
     res.status(201).json({
       success: true,
       analysis,
       message: 'Analysis created successfully',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to create analysis',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -441,7 +449,7 @@ function updateAnalysis(id, data, res) {
       return res.status(400).json({
         success: false,
         error: 'Analysis ID is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -450,7 +458,7 @@ function updateAnalysis(id, data, res) {
       return res.status(404).json({
         success: false,
         error: 'Analysis not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -462,20 +470,20 @@ function updateAnalysis(id, data, res) {
       updatedAt: new Date().toISOString()
     };
 
-    analyses.set(id, updatedAnalysis);
+    putAnalysis(updatedAnalysis);
 
     res.status(200).json({
       success: true,
       analysis: updatedAnalysis,
       message: 'Analysis updated successfully',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to update analysis',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -486,7 +494,7 @@ function deleteAnalysis(id, res) {
       return res.status(400).json({
         success: false,
         error: 'Analysis ID is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -495,23 +503,23 @@ function deleteAnalysis(id, res) {
       return res.status(404).json({
         success: false,
         error: 'Analysis not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
-    analyses.delete(id);
+    removeAnalysis(analysis);
 
     res.status(200).json({
       success: true,
       message: 'Analysis deleted successfully',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to delete analysis',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -524,7 +532,7 @@ function getUser(id, res) {
       return res.status(400).json({
         success: false,
         error: 'User ID is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -533,21 +541,21 @@ function getUser(id, res) {
       return res.status(404).json({
         success: false,
         error: 'User not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     res.status(200).json({
       success: true,
       user,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to fetch user',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -560,18 +568,19 @@ function createUser(data, res) {
       return res.status(400).json({
         success: false,
         error: 'Name and email are required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     const userId = generateId();
+    const now = new Date().toISOString();
     const user = {
       id: userId,
       name,
       email,
       preferences: preferences || {},
-      createdAt: new Date().toISOString(),
-      updatedAt: new Date().toISOString()
+      createdAt: now,
+      updatedAt: now
     };
 
     users.set(userId, user);
@@ -580,14 +589,14 @@ function createUser(data, res) {
       success: true,
       user,
       message: 'User created successfully',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to create user',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -598,7 +607,7 @@ function updateUser(id, data, res) {
       return res.status(400).json({
         success: false,
         error: 'User ID is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -607,7 +616,7 @@ function updateUser(id, data, res) {
       return res.status(404).json({
         success: false,
         error: 'User not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -625,14 +634,14 @@ function updateUser(id, data, res) {
       success: true,
       user: updatedUser,
       message: 'User updated successfully',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to update user',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
@@ -643,7 +652,7 @@ function deleteUser(id, res) {
       return res.status(400).json({
         success: false,
         error: 'User ID is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
@@ -652,46 +661,99 @@ function deleteUser(id, res) {
       return res.status(404).json({
         success: false,
         error: 'User not found',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     users.delete(id);
 
     // Also delete user's networks and analyses
-    const userNetworks = Array.from(networks.values())
-      .filter(network => network.userId === id);
-    userNetworks.forEach(network => networks.delete(network.id));
+    const userNetworks = lookup(networksByUser, id, networks);
+    userNetworks.forEach(removeNetwork);
 
-    const userAnalyses = Array.from(analyses.values())
-      .filter(analysis => analysis.userId === id);
-    userAnalyses.forEach(analysis => analyses.delete(analysis.id));
+    const userAnalyses = lookup(analysesByUser, id, analyses);
+    userAnalyses.forEach(removeAnalysis);
 
     res.status(200).json({
       success: true,
       message: 'User deleted successfully',
       deletedNetworks: userNetworks.length,
       deletedAnalyses: userAnalyses.length,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     res.status(500).json({
       success: false,
       error: 'Failed to delete user',
       details: error.message,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   }
 }
 
 // Helper functions
 
+function indexAdd(index, key, id) {
+  let ids = index.get(key);
+  if (!ids) {
+    ids = new Set();
+    index.set(key, ids);
+  }
+  ids.add(id);
+}
+
+function indexRemove(index, key, id) {
+  const ids = index.get(key);
+  if (!ids) return;
+  ids.delete(id);
+  if (ids.size === 0) index.delete(key);
+}
+
+// Records whose indexed key is `key`
+function lookup(index, key, records) {
+  const ids = index.get(key);
+  return ids ? Array.from(ids, id => records.get(id)) : [];
+}
+
+// Writes keep the secondary indexes in step with the primary maps; updates
+// may move a record to another user or network
+function putNetwork(network) {
+  const previous = networks.get(network.id);
+  if (previous) indexRemove(networksByUser, previous.userId, network.id);
+  networks.set(network.id, network);
+  indexAdd(networksByUser, network.userId, network.id);
+}
+
+function removeNetwork(network) {
+  networks.delete(network.id);
+  indexRemove(networksByUser, network.userId, network.id);
+}
+
+function putAnalysis(analysis) {
+  const previous = analyses.get(analysis.id);
+  if (previous) {
+    indexRemove(analysesByUser, previous.userId, analysis.id);
+    indexRemove(analysesByNetwork, previous.networkId, analysis.id);
+  }
+  analyses.set(analysis.id, analysis);
+  indexAdd(analysesByUser, analysis.userId, analysis.id);
+  indexAdd(analysesByNetwork, analysis.networkId, analysis.id);
+}
+
+function removeAnalysis(analysis) {
+  analyses.delete(analysis.id);
+  indexRemove(analysesByUser, analysis.userId, analysis.id);
+  indexRemove(analysesByNetwork, analysis.networkId, analysis.id);
+}
+
 function generateId() {
-  return Date.now().toString(36) + Math.random().toString(36).substr(2);
+  return randomUUID();
 }
 
 // Initialize with sample data
 function initializeSampleData() {
+  const now = new Date().toISOString();
+
   // Sample user
   const sampleUser = {
     id: 'user_1',
@@ -701,8 +763,8 @@ function initializeSampleData() {
       defaultAlgorithm: 'pagerank',
       visualizationTheme: 'dark'
     },
-    createdAt: new Date().toISOString(),
-    updatedAt: new Date().toISOString()
+    createdAt: now,
+    updatedAt: now
   };
   users.set('user_1', sampleUser);
 
@@ -732,10 +794,10 @@ function initializeSampleData() {
       type: 'social',
       directed: false
     },
-    createdAt: new Date().toISOString(),
-    updatedAt: new Date().toISOString()
+    createdAt: now,
+    updatedAt: now
   };
-  networks.set('network_1', sampleNetwork);
+  putNetwork(sampleNetwork);
 
   // Sample analysis
   const sampleAnalysis = {
@@ -762,10 +824,10 @@ function initializeSampleData() {
     },
     status: 'completed',
     userId: 'user_1',
-    createdAt: new Date().toISOString(),
-    updatedAt: new Date().toISOString()
+    createdAt: now,
+    updatedAt: now
   };
-  analyses.set('analysis_1', sampleAnalysis);
+  putAnalysis(sampleAnalysis);
 }
 
 // Initialize sample data on first load
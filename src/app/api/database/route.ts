@@ -1,12 +1,45 @@
+import { randomUUID } from 'crypto';
 import { NextRequest, NextResponse } from 'next/server';
+import { isoTimestamp } from '@/lib/timestamp';
 
 // In-memory database simulation
 let networks = new Map();
 let analyses = new Map();
 
-// Initialize with sample data
+// Owner id -> Set of network ids, so per-user listings don't scan every
+// network
+const networksByUser = new Map<string, Set<string>>();
+
+// Writes keep the user index in step with the network map; updates may
+// move a network to another user
+function putNetwork(network: any) {
+  const previous = networks.get(network.id);
+  if (previous) unindexNetwork(previous);
+  networks.set(network.id, network);
+  let ids = networksByUser.get(network.userId);
+  if (!ids) {
+    ids = new Set();
+    networksByUser.set(network.userId, ids);
+  }
+  ids.add(network.id);
+}
+
+function removeNetwork(network: any) {
+  networks.delete(network.id);
+  unindexNetwork(network);
+}
+
+function unindexNetwork(network: any) {
+  const ids = networksByUser.get(network.userId);
+  if (!ids) return;
+  ids.delete(network.id);
+  if (ids.size === 0) networksByUser.delete(network.userId);
+}
+
+// Seeded once when the module loads, rather than checked on every request
 function initializeSampleData() {
   if (networks.size === 0) {
+    const now = new Date().toISOString();
     const sampleNetwork = {
       id: 'network_1',
       name: 'Sample Social Network',
@@ -28,15 +61,17 @@ function initializeSampleData() {
         { source: 'B', target: 'D', weight: 1 }
       ],
       userId: 'user_1',
-      createdAt: new Date().toISOString(),
-      updatedAt: new Date().toISOString()
+      createdAt: now,
+      updatedAt: now
     };
-    networks.set('network_1', sampleNetwork);
+    putNetwork(sampleNetwork);
   }
 }
 
+initializeSampleData();
+
 function generateId() {
-  return Date.now().toString(36) + Math.random().toString(36).substr(2);
+  return randomUUID();
 }
 
 export async function GET(request: NextRequest) {
@@ -45,11 +80,9 @@ export async function GET(request: NextRequest) {
     const type = searchParams.get('type');
     const userId = searchParams.get('userId');
 
-    initializeSampleData();
-
     if (type === 'networks') {
-      const userNetworks = Array.from(networks.values())
-        .filter(network => !userId || network.userId === userId)
+      const owned = userId ? Array.from(networksByUser.get(userId) ?? [], id => networks.get(id)) : null;
+      const userNetworks = (owned ?? Array.from(networks.values()))
         .map(network => ({
           id: network.id,
           name: network.name,
@@ -65,14 +98,14 @@ export async function GET(request: NextRequest) {
         success: true,
         networks: userNetworks,
         total: userNetworks.length,
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     return NextResponse.json({
       success: false,
       error: 'Invalid type parameter',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 400 });
   } catch (error) {
     console.error('Database GET API error:', error);
@@ -80,7 +113,7 @@ export async function GET(request: NextRequest) {
       success: false,
       error: 'Failed to fetch data from database',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
@@ -90,8 +123,6 @@ export async function POST(request: NextRequest) {
     const body = await request.json();
     const { type } = body;
 
-    initializeSampleData();
-
     if (type === 'network') {
       const { name, description, nodes, edges, userId, metadata } = body;
       
@@ -99,11 +130,12 @@ export async function POST(request: NextRequest) {
         return NextResponse.json({
           success: false,
           error: 'Network name and nodes are required',
-          timestamp: new Date().toISOString()
+          timestamp: isoTimestamp()
         }, { status: 400 });
       }
 
       const networkId = generateId();
+      const now = new Date().toISOString();
       const network = {
         id: networkId,
         name,
@@ -112,24 +144,24 @@ export async function POST(request: NextRequest) {
         edges: edges || [],
         userId: userId || 'anonymous',
         metadata: metadata || {},
-        createdAt: new Date().toISOString(),
-        updatedAt: new Date().toISOString()
+        createdAt: now,
+        updatedAt: now
       };
 
-      networks.set(networkId, network);
+      putNetwork(network);
 
       return NextResponse.json({
         success: true,
         network,
         message: 'Network created successfully',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 201 });
     }
 
     return NextResponse.json({
       success: false,
       error: 'Invalid type parameter',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 400 });
   } catch (error) {
     console.error('Database POST API error:', error);
@@ -137,7 +169,7 @@ export async function POST(request: NextRequest) {
       success: false,
       error: 'Failed to save data to database',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
@@ -147,14 +179,12 @@ export async function PUT(request: NextRequest) {
     const body = await request.json();
     const { type, id } = body;
 
-    initializeSampleData();
-
     if (type === 'network') {
       if (!id) {
         return NextResponse.json({
           success: false,
           error: 'Network ID is required',
-          timestamp: new Date().toISOString()
+          timestamp: isoTimestamp()
         }, { status: 400 });
       }
 
@@ -163,7 +193,7 @@ export async function PUT(request: NextRequest) {
         return NextResponse.json({
           success: false,
           error: 'Network not found',
-          timestamp: new Date().toISOString()
+          timestamp: isoTimestamp()
         }, { status: 404 });
       }
 
@@ -175,20 +205,20 @@ export async function PUT(request: NextRequest) {
         updatedAt: new Date().toISOString()
       };
 
-      networks.set(id, updatedNetwork);
+      putNetwork(updatedNetwork);
 
       return NextResponse.json({
         success: true,
         network: updatedNetwork,
         message: 'Network updated successfully',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     return NextResponse.json({
       success: false,
       error: 'Invalid type parameter',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 400 });
   } catch (error) {
     console.error('Database PUT API error:', error);
@@ -196,7 +226,7 @@ export async function PUT(request: NextRequest) {
       success: false,
       error: 'Failed to update data in database',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
@@ -207,14 +237,12 @@ export async function DELETE(request: NextRequest) {
     const type = searchParams.get('type');
     const id = searchParams.get('id');
 
-    initializeSampleData();
-
     if (type === 'network') {
       if (!id) {
         return NextResponse.json({
           success: false,
           error: 'Network ID is required',
-          timestamp: new Date().toISOString()
+          timestamp: isoTimestamp()
         }, { status: 400 });
       }
 
@@ -223,23 +251,23 @@ export async function DELETE(request: NextRequest) {
         return NextResponse.json({
           success: false,
           error: 'Network not found',
-          timestamp: new Date().toISOString()
+          timestamp: isoTimestamp()
         }, { status: 404 });
       }
 
-      networks.delete(id);
+      removeNetwork(network);
 
       return NextResponse.json({
         success: true,
         message: 'Network deleted successfully',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       });
     }
 
     return NextResponse.json({
       success: false,
       error: 'Invalid type parameter',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 400 });
   } catch (error) {
     console.error('Database DELETE API error:', error);
@@ -247,7 +275,7 @@ export async function DELETE(request: NextRequest) {
       success: false,
       error: 'Failed to delete data from database',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
\ No newline at end of file
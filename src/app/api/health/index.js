@@ -2,6 +2,46 @@
  * NetworkOracle Pro - Health Check API for Vercel (Node.js)
  */
 
+import { isoTimestamp } from '../_shared/timestamp';
+
+// The health payload never changes apart from its timestamp, so it is
+// encoded once at module load around a placeholder and each response only
+// splices the current timestamp in
+const HEALTH_TEMPLATE = JSON.stringify({
+  status: "healthy",
+  service: "NetworkOracle Pro - Vercel Backend",
+  version: "1.0.0",
+  timestamp: '\0',
+  environment: "production",
+  endpoints: {
+    centrality: "/api/centrality",
+    analysis: "/api/analysis",
+    health: "/api/health"
+  },
+  features: [
+    "Centrality Analysis",
+    "Network Metrics",
+    "Community Detection",
+    "Path Analysis"
+  ]
+});
+const [HEALTH_HEAD, HEALTH_TAIL] = HEALTH_TEMPLATE.split('"\\u0000"');
+
+// Probes within one step of the shared timestamp cache get the same
+// timestamp, and so the same body; it is assembled once per step and resent
+// as-is in between
+let healthIso = '';
+let healthBody = '';
+
+function healthResponse() {
+  const iso = isoTimestamp();
+  if (iso !== healthIso) {
+    healthIso = iso;
+    healthBody = HEALTH_HEAD + JSON.stringify(iso) + HEALTH_TAIL;
+  }
+  return healthBody;
+}
+
 export default function handler(req, res) {
   // Enable CORS
   res.setHeader('Access-Control-Allow-Origin', '*');
@@ -14,32 +54,14 @@ export default function handler(req, res) {
   }
 
   if (req.method === 'GET') {
-    const response = {
-      status: "healthy",
-      service: "NetworkOracle Pro - Vercel Backend",
-      version: "1.0.0",
-      timestamp: new Date().toISOString(),
-      environment: "production",
-      endpoints: {
-        centrality: "/api/centrality",
-        analysis: "/api/analysis",
-        health: "/api/health"
-      },
-      features: [
-        "Centrality Analysis",
-        "Network Metrics",
-        "Community Detection",
-        "Path Analysis"
-      ]
-    };
-
-    res.status(200).json(response);
+    res.setHeader('Content-Type', 'application/json; charset=utf-8');
+    res.status(200).send(healthResponse());
     return;
   }
 
   res.status(405).json({
     status: "error",
     message: "Method not allowed",
-    timestamp: new Date().toISOString()
+    timestamp: isoTimestamp()
   });
 }
@@ -1,40 +1,96 @@
 import { NextResponse } from 'next/server';
+import { REQUEST_TIMEOUTS, type ServiceClient, centralityService } from '@/lib/services';
+import { isoTimestamp } from '@/lib/timestamp';
 
-const CENTRALITY_SERVICE_URL = process.env.CENTRALITY_SERVICE_URL || 'http://localhost:8001';
+// Downstream services reported under `services`, keyed by response field
+const PROBED_SERVICES: Record<string, ServiceClient> = {
+  backend: centralityService
+};
+
+// Every probe in a check shares one deadline signal, so a host that accepts
+// the connection but never answers is cut off at the same instant as the
+// rest instead of each probe arming its own timer
+async function probe(service: ServiceClient, deadline: AbortSignal) {
+  const response = await service.request('/health', { method: 'GET', signal: deadline });
+
+  // Only the status matters; release the body unread instead of buffering
+  // and parsing the backend's payload
+  await response.body?.cancel();
+  return response.ok;
+}
+
+// Pollers hit this endpoint far more often than backend health changes, so
+// results are reused for a short TTL and concurrent misses share one check
+const HEALTH_TTL_MS = 5000;
+const CACHE_HEADERS = { 'Cache-Control': `max-age=${HEALTH_TTL_MS / 1000}` };
+
+interface HealthReport {
+  // performance.now() at check time: monotonic, so a wall-clock change
+  // can't stretch or cut short the cache lifetime
+  checkedAt: number;
+  status: number;
+  body: any;
+}
+
+let cachedReport: HealthReport | null = null;
+let pendingReport: Promise<HealthReport> | null = null;
 
 export async function GET() {
-  try {
-    // Check backend service health
-    const backendResponse = await fetch(`${CENTRALITY_SERVICE_URL}/health`, {
-      method: 'GET',
-      headers: {
-        'Content-Type': 'application/json',
-      },
+  let report = cachedReport;
+  if (!report || performance.now() - report.checkedAt >= HEALTH_TTL_MS) {
+    pendingReport ??= checkServices().then(result => {
+      cachedReport = result;
+      return result;
+    }).finally(() => {
+      pendingReport = null;
     });
+    report = await pendingReport;
+  }
 
-    const backendHealth = backendResponse.ok ? await backendResponse.json() : null;
+  return NextResponse.json(report.body, { status: report.status, headers: CACHE_HEADERS });
+}
+
+async function checkServices(): Promise<HealthReport> {
+  // Probes run concurrently, so the check takes as long as the slowest
+  // service rather than the sum of all of them
+  const names = Object.keys(PROBED_SERVICES);
+  const deadline = AbortSignal.timeout(REQUEST_TIMEOUTS.health);
+  const outcomes = await Promise.allSettled(names.map(name => probe(PROBED_SERVICES[name], deadline)));
 
-    return NextResponse.json({
+  const services: Record<string, string> = { frontend: 'healthy' };
+  let error: string | null = null;
+  outcomes.forEach((outcome, i) => {
+    if (outcome.status === 'fulfilled') {
+      services[names[i]] = outcome.value ? 'healthy' : 'unhealthy';
+    } else {
+      services[names[i]] = 'unreachable';
+      error ??= outcome.reason instanceof Error ? outcome.reason.message : 'Unknown error';
+    }
+  });
+  services.database = 'unknown'; // Will be checked by backend
+
+  if (error !== null) {
+    return {
+      checkedAt: performance.now(),
+      status: 503,
+      body: {
+        status: 'degraded',
+        timestamp: isoTimestamp(),
+        services,
+        version: '1.0.0',
+        error
+      }
+    };
+  }
+
+  return {
+    checkedAt: performance.now(),
+    status: 200,
+    body: {
       status: 'healthy',
-      timestamp: new Date().toISOString(),
-      services: {
-        frontend: 'healthy',
-        backend: backendHealth ? 'healthy' : 'unhealthy',
-        database: 'unknown' // Will be checked by backend
-      },
+      timestamp: isoTimestamp(),
+      services,
       version: '1.0.0'
-    });
-  } catch (error) {
-    return NextResponse.json({
-      status: 'degraded',
-      timestamp: new Date().toISOString(),
-      services: {
-        frontend: 'healthy',
-        backend: 'unreachable',
-        database: 'unknown'
-      },
-      version: '1.0.0',
-      error: error instanceof Error ? error.message : 'Unknown error'
-    }, { status: 503 });
-  }
+    }
+  };
 }
@@ -1,4 +1,56 @@
+import { randomUUID } from 'crypto';
 import { NextRequest, NextResponse } from 'next/server';
+import { LRUCache } from '@/lib/cache';
+import { louvain } from '@/lib/community';
+import {
+  CENTRALITY_ALGORITHMS,
+  type CentralityNetwork,
+  type CentralityScores,
+  centralityCache,
+  centralityCacheKey,
+  centralityJson,
+  computeCentralities,
+  resolveCentralityNetwork
+} from '@/lib/centrality';
+import { type IndexedGraph, shortestPathSummary, structuralSummary } from '@/lib/graph';
+import { preEncodedJson } from '@/lib/responses';
+import { isoTimestamp } from '@/lib/timestamp';
+
+const JSON_HEADERS = { 'Content-Type': 'application/json' };
+
+// Batch jobs run after the 202 response is sent; clients poll their status
+// through GET ?workflow=batch_processing&jobId=... Jobs live in this
+// process's memory only, so status is best-effort: a serverless runtime
+// may suspend the work once the response is out, a restart or eviction
+// loses it, and a poll served by another instance finds no job. Callers
+// that need the results reliably send `wait: true` instead.
+interface BatchJob {
+  id: string;
+  status: 'queued' | 'running' | 'completed' | 'failed';
+  createdAt: string;
+  estimatedCompletion: string;
+  results: any;
+  error?: string;
+  // Serialized status, filled once the job reaches a terminal state
+  statusJson?: string;
+}
+
+const batchJobs = new LRUCache<string, BatchJob>(256);
+
+// Dashboards poll once a second; in-flight status may be reused by clients
+// for that long. Finished jobs no longer change but can be evicted, and each
+// response carries its own timestamp, so they are cached only briefly.
+const POLL_HEADERS = { 'Cache-Control': 'private, max-age=1' };
+const FINISHED_JOB_HEADERS = {
+  'Content-Type': 'application/json',
+  'Cache-Control': 'private, max-age=60'
+};
+
+// Typical per-job processing time used for the completion estimate
+const BATCH_JOB_ESTIMATE_MS = 50;
+
+// Shortest-path statistics sample this many sources on larger networks
+const STRUCTURAL_PATH_SOURCES = 1000;
 
 export async function GET(request: NextRequest) {
   try {
@@ -7,16 +59,18 @@ export async function GET(request: NextRequest) {
     
     switch (workflow) {
       case 'complete_analysis':
-        return getCompleteAnalysisWorkflow(NextResponse);
+        return completeAnalysisWorkflowResponse();
       case 'network_comparison':
-        return getNetworkComparisonWorkflow(NextResponse);
-      case 'batch_processing':
-        return getBatchProcessingWorkflow(NextResponse);
+        return networkComparisonWorkflowResponse();
+      case 'batch_processing': {
+        const jobId = searchParams.get('jobId');
+        return jobId ? getBatchJobStatus(jobId, NextResponse) : batchProcessingWorkflowResponse();
+      }
       default:
         return NextResponse.json({
           success: false,
           error: 'Invalid workflow parameter',
-          timestamp: new Date().toISOString()
+          timestamp: isoTimestamp()
         }, { status: 400 });
     }
   } catch (error) {
@@ -25,7 +79,7 @@ export async function GET(request: NextRequest) {
       success: false,
       error: 'Failed to fetch workflow information',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
@@ -48,7 +102,7 @@ export async function POST(request: NextRequest) {
         return NextResponse.json({
           success: false,
           error: 'Invalid workflow parameter',
-          timestamp: new Date().toISOString()
+          timestamp: isoTimestamp()
         }, { status: 400 });
     }
   } catch (error) {
@@ -57,202 +111,231 @@ export async function POST(request: NextRequest) {
       success: false,
       error: 'Internal server error',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
 
 // Workflow Descriptions
-function getCompleteAnalysisWorkflow(res: typeof NextResponse) {
-  const workflow = {
-    name: 'Complete Network Analysis',
-    description: 'Performs comprehensive network analysis including centrality, community detection, and structural analysis',
-    steps: [
-      {
-        step: 1,
-        name: 'Network Validation',
-        description: 'Validates network structure and computes basic metrics'
-      },
-      {
-        step: 2,
-        name: 'Centrality Analysis',
-        description: 'Computes multiple centrality measures (Degree, Betweenness, Closeness, Eigenvector, PageRank)'
-      },
-      {
-        step: 3,
-        name: 'Community Detection',
-        description: 'Identifies communities using Louvain algorithm'
-      },
-      {
-        step: 4,
-        name: 'Structural Analysis',
-        description: 'Computes clustering coefficient, density, and other structural properties'
-      },
-      {
-        step: 5,
-        name: 'Results Integration',
-        description: 'Combines all results into comprehensive report'
-      }
-    ],
-    parameters: {
-      network: {
-        type: 'object',
-        required: true,
-        description: 'Network data with nodes and edges'
-      },
-      algorithms: {
-        type: 'array',
-        required: false,
-        description: 'Specific algorithms to run (default: all)'
-      },
-      saveResults: {
-        type: 'boolean',
-        required: false,
-        default: true,
-        description: 'Whether to save results to database'
-      },
-      userId: {
-        type: 'string',
-        required: false,
-        description: 'User ID for saving results'
-      }
+// Static, so each is encoded once per process rather than per request
+const COMPLETE_ANALYSIS_WORKFLOW = {
+  name: 'Complete Network Analysis',
+  description: 'Performs comprehensive network analysis including centrality, community detection, and structural analysis',
+  steps: [
+    {
+      step: 1,
+      name: 'Network Validation',
+      description: 'Validates network structure and computes basic metrics'
+    },
+    {
+      step: 2,
+      name: 'Centrality Analysis',
+      description: 'Computes multiple centrality measures (Degree, Betweenness, Closeness, Eigenvector, PageRank)'
+    },
+    {
+      step: 3,
+      name: 'Community Detection',
+      description: 'Identifies communities using Louvain algorithm'
+    },
+    {
+      step: 4,
+      name: 'Structural Analysis',
+      description: 'Computes clustering coefficient, density, and other structural properties'
+    },
+    {
+      step: 5,
+      name: 'Results Integration',
+      description: 'Combines all results into comprehensive report'
     }
-  };
+  ],
+  parameters: {
+    network: {
+      type: 'object',
+      required: true,
+      description: 'Network data with nodes and edges'
+    },
+    algorithms: {
+      type: 'array',
+      required: false,
+      description: 'Specific algorithms to run (default: all)'
+    },
+    saveResults: {
+      type: 'boolean',
+      required: false,
+      default: true,
+      description: 'Whether to save results to database'
+    },
+    userId: {
+      type: 'string',
+      required: false,
+      description: 'User ID for saving results'
+    }
+  }
+};
 
-  return res.json({
-    success: true,
-    workflow,
-    timestamp: new Date().toISOString()
-  });
-}
+const completeAnalysisWorkflowResponse = preEncodedJson({ success: true, workflow: COMPLETE_ANALYSIS_WORKFLOW });
 
-function getNetworkComparisonWorkflow(res: typeof NextResponse) {
-  const workflow = {
-    name: 'Network Comparison Analysis',
-    description: 'Compares two or more networks using various metrics',
-    steps: [
-      {
-        step: 1,
-        name: 'Network Loading',
-        description: 'Loads multiple networks for comparison'
-      },
-      {
-        step: 2,
-        name: 'Individual Analysis',
-        description: 'Performs analysis on each network'
-      },
-      {
-        step: 3,
-        name: 'Metric Comparison',
-        description: 'Compares metrics across networks'
-      },
-      {
-        step: 4,
-        name: 'Statistical Analysis',
-        description: 'Performs statistical tests on differences'
-      },
-      {
-        step: 5,
-        name: 'Visualization Data',
-        description: 'Prepares data for comparative visualization'
-      }
-    ],
-    parameters: {
-      networks: {
-        type: 'array',
-        required: true,
-        description: 'Array of network data objects'
-      },
-      metrics: {
-        type: 'array',
-        required: false,
-        description: 'Specific metrics to compare'
-      },
-      statisticalTests: {
-        type: 'array',
-        required: false,
-        description: 'Statistical tests to perform'
-      }
+const NETWORK_COMPARISON_WORKFLOW = {
+  name: 'Network Comparison Analysis',
+  description: 'Compares two or more networks using various metrics',
+  steps: [
+    {
+      step: 1,
+      name: 'Network Loading',
+      description: 'Loads multiple networks for comparison'
+    },
+    {
+      step: 2,
+      name: 'Individual Analysis',
+      description: 'Performs analysis on each network'
+    },
+    {
+      step: 3,
+      name: 'Metric Comparison',
+      description: 'Compares metrics across networks'
+    },
+    {
+      step: 4,
+      name: 'Statistical Analysis',
+      description: 'Performs statistical tests on differences'
+    },
+    {
+      step: 5,
+      name: 'Visualization Data',
+      description: 'Prepares data for comparative visualization'
     }
-  };
+  ],
+  parameters: {
+    networks: {
+      type: 'array',
+      required: true,
+      description: 'Array of network data objects'
+    },
+    metrics: {
+      type: 'array',
+      required: false,
+      description: 'Specific metrics to compare'
+    },
+    statisticalTests: {
+      type: 'array',
+      required: false,
+      description: 'Statistical tests to perform'
+    }
+  }
+};
 
-  return res.json({
-    success: true,
-    workflow,
-    timestamp: new Date().toISOString()
-  });
-}
+const networkComparisonWorkflowResponse = preEncodedJson({ success: true, workflow: NETWORK_COMPARISON_WORKFLOW });
 
-function getBatchProcessingWorkflow(res: typeof NextResponse) {
-  const workflow = {
-    name: 'Batch Processing',
-    description: 'Processes multiple networks or analyses in batch',
-    steps: [
-      {
-        step: 1,
-        name: 'Job Queue Creation',
-        description: 'Creates processing queue from input data'
-      },
-      {
-        step: 2,
-        name: 'Parallel Processing',
-        description: 'Processes jobs in parallel where possible'
-      },
-      {
-        step: 3,
-        name: 'Progress Tracking',
-        description: 'Tracks progress and handles errors'
-      },
-      {
-        step: 4,
-        name: 'Results Aggregation',
-        description: 'Aggregates results from all jobs'
-      },
-      {
-        step: 5,
-        name: 'Summary Generation',
-        description: 'Generates summary report'
-      }
-    ],
-    parameters: {
-      jobs: {
-        type: 'array',
-        required: true,
-        description: 'Array of job specifications'
-      },
-      maxConcurrency: {
-        type: 'number',
-        required: false,
-        default: 5,
-        description: 'Maximum concurrent jobs'
-      },
-      onError: {
-        type: 'string',
-        required: false,
-        default: 'continue',
-        description: 'Error handling strategy'
-      }
+const BATCH_PROCESSING_WORKFLOW = {
+  name: 'Batch Processing',
+  description: 'Processes multiple networks or analyses in batch',
+  steps: [
+    {
+      step: 1,
+      name: 'Job Queue Creation',
+      description: 'Creates processing queue from input data'
+    },
+    {
+      step: 2,
+      name: 'Parallel Processing',
+      description: 'Processes jobs in parallel where possible'
+    },
+    {
+      step: 3,
+      name: 'Progress Tracking',
+      description: 'Tracks progress and handles errors'
+    },
+    {
+      step: 4,
+      name: 'Results Aggregation',
+      description: 'Aggregates results from all jobs'
+    },
+    {
+      step: 5,
+      name: 'Summary Generation',
+      description: 'Generates summary report'
     }
-  };
+  ],
+  parameters: {
+    jobs: {
+      type: 'array',
+      required: true,
+      description: 'Array of job specifications'
+    },
+    maxConcurrency: {
+      type: 'number',
+      required: false,
+      default: 5,
+      description: 'Maximum concurrent jobs'
+    },
+    onError: {
+      type: 'string',
+      required: false,
+      default: 'continue',
+      description: 'Error handling strategy'
+    },
+    ignoreResult: {
+      type: 'boolean',
+      required: false,
+      default: false,
+      description: 'Run without retaining job status or results for polling'
+    },
+    wait: {
+      type: 'boolean',
+      required: false,
+      default: false,
+      description: 'Process the batch within the request and return its results; polled status is kept only on the serving instance'
+    }
+  }
+};
+
+const batchProcessingWorkflowResponse = preEncodedJson({ success: true, workflow: BATCH_PROCESSING_WORKFLOW });
 
-  return res.json({
-    success: true,
-    workflow,
-    timestamp: new Date().toISOString()
+function getBatchJobStatus(jobId: string, res: typeof NextResponse) {
+  const job = batchJobs.get(jobId);
+  if (!job) {
+    return res.json({
+      success: false,
+      error: 'Batch job not found',
+      timestamp: isoTimestamp()
+    }, { status: 404 });
+  }
+
+  const finished = job.status === 'completed' || job.status === 'failed';
+  if (!finished || !job.statusJson) {
+    const status = {
+      success: job.status !== 'failed',
+      jobId: job.id,
+      status: job.status,
+      createdAt: job.createdAt,
+      estimatedCompletion: job.estimatedCompletion,
+      results: job.status === 'completed' ? job.results : null,
+      error: job.error
+    };
+    if (!finished) {
+      return res.json({ ...status, timestamp: isoTimestamp() }, { headers: POLL_HEADERS });
+    }
+    // Terminal status never changes, so it is serialized once and later
+    // polls only splice in the timestamp
+    job.statusJson = JSON.stringify(status).slice(0, -1);
+  }
+
+  return new res(`${job.statusJson},"timestamp":${JSON.stringify(isoTimestamp())}}`, {
+    headers: FINISHED_JOB_HEADERS
   });
 }
 
 // Workflow Executions
 async function performCompleteAnalysis(data: any, res: typeof NextResponse) {
   try {
-    const startTime = Date.now();
+    const startTime = performance.now();
     const { network, algorithms = [], saveResults = true, userId = 'anonymous' } = data;
 
     if (!network || !network.nodes || !network.edges) {
       return res.json({
         success: false,
         error: 'Network data is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
 
@@ -279,91 +362,135 @@ async function performCompleteAnalysis(data: any, res: typeof NextResponse) {
         success: false,
         error: 'Invalid network data',
         details: validationResult.errors,
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
 
     // Step 2: Centrality Analysis
     const centralityAlgorithms = algorithms.length > 0 ? algorithms : 
       ['degree', 'betweenness', 'closeness', 'eigenvector', 'pagerank'];
-    
+
+    const unknown = centralityAlgorithms.find((algorithm: string) =>
+      !CENTRALITY_ALGORITHMS.has(String(algorithm).toLowerCase()));
+    if (unknown !== undefined) {
+      return res.json({
+        success: false,
+        error: `Unknown algorithm: ${unknown}`,
+        timestamp: isoTimestamp()
+      }, { status: 400 });
+    }
+
+    // The network is resolved once and every algorithm looked up in one
+    // cache pass; only misses are computed, and stored together afterwards
+    const resolved = resolveCentralityNetwork(network);
+    const cacheKeys = centralityAlgorithms.map((algorithm: string) =>
+      centralityCacheKey(algorithm.toLowerCase(), resolved.key));
+    const cachedEntries = centralityCache.getMany(cacheKeys);
+
+    // Misses are computed together, so each reports the shared batch time
+    const misses = centralityAlgorithms.filter((_: string, i: number) => !cachedEntries[i]);
+    const batchStart = performance.now();
+    const computed = await computeCentralityMisses(resolved, misses);
+    const batchDuration = Math.round(performance.now() - batchStart);
+
+    const centralityRuns = centralityAlgorithms.map((algorithm: string, i: number) => {
+      const cached = cachedEntries[i];
+      return {
+        algorithm,
+        cached: !!cached,
+        entry: cached ?? { scores: computed[algorithm.toLowerCase()] },
+        duration: cached ? 0 : batchDuration
+      };
+    });
+
+    centralityCache.setMany(centralityRuns.flatMap((run: any, i: number) =>
+      run.cached ? [] : [[cacheKeys[i], run.entry] as const]));
+
+    // Step 2: Centrality Analysis. Integration only reads the statistics;
+    // each step's result is encoded from the cache entry's serialized form,
+    // so per-node records are built and serialized once per entry rather
+    // than on every response
     const centralityResults: Record<string, any> = {};
-    for (const algorithm of centralityAlgorithms) {
-      const stepStart = Date.now();
-      const centralityResult = await computeCentrality(network, algorithm);
-      centralityResults[algorithm] = centralityResult;
-      
-      results.steps.push({
+    const encodedResults = new Map<any, string>();
+    for (const run of centralityRuns) {
+      centralityResults[run.algorithm] = { statistics: run.entry.scores.statistics };
+      const step = {
         step: 2,
-        name: `Centrality Analysis - ${algorithm}`,
+        name: `Centrality Analysis - ${run.algorithm}`,
         status: 'completed',
-        duration: Date.now() - stepStart,
-        result: centralityResult
-      });
+        duration: run.duration
+      };
+      encodedResults.set(step, `{"algorithm":${JSON.stringify(run.algorithm)},${centralityJson(run.entry).slice(1)}`);
+      results.steps.push(step);
     }
 
     // Step 3: Community Detection
-    const communityStart = Date.now();
-    const communityResult = await detectCommunities(network, 'louvain');
+    const communityStart = performance.now();
+    const communityResult = detectCommunities(resolved.graph, 'louvain');
     results.steps.push({
       step: 3,
       name: 'Community Detection',
       status: 'completed',
-      duration: Date.now() - communityStart,
+      duration: Math.round(performance.now() - communityStart),
       result: communityResult
     });
 
     // Step 4: Structural Analysis
-    const structuralStart = Date.now();
-    const structuralResult = await analyzeStructure(network);
+    const structuralStart = performance.now();
+    const structuralResult = analyzeStructure(resolved.graph);
     results.steps.push({
       step: 4,
       name: 'Structural Analysis',
       status: 'completed',
-      duration: Date.now() - structuralStart,
+      duration: Math.round(performance.now() - structuralStart),
       result: structuralResult
     });
 
     // Step 5: Results Integration
-    const integrationStart = Date.now();
+    const integrationStart = performance.now();
     const summary = integrateResults(validationResult, centralityResults, communityResult, structuralResult);
     results.summary = summary;
-    results.totalTime = Date.now() - startTime;
+    results.totalTime = Math.round(performance.now() - startTime);
 
     results.steps.push({
       step: 5,
       name: 'Results Integration',
       status: 'completed',
-      duration: Date.now() - integrationStart,
+      duration: Math.round(performance.now() - integrationStart),
       result: summary
     });
 
-    return res.json({
-      success: true,
-      results,
-      timestamp: new Date().toISOString()
+    const steps = results.steps.map(step => {
+      const result = encodedResults.get(step);
+      if (result === undefined) return JSON.stringify(step);
+      return `${JSON.stringify(step).slice(0, -1)},"result":${result}}`;
     });
+    const body = `{"success":true,"results":{"workflow":${JSON.stringify(results.workflow)},` +
+      `"networkId":${JSON.stringify(results.networkId)},"steps":[${steps.join(',')}],` +
+      `"summary":${JSON.stringify(results.summary)},"totalTime":${results.totalTime}},` +
+      `"timestamp":${JSON.stringify(isoTimestamp())}}`;
+    return new res(body, { headers: JSON_HEADERS });
   } catch (error) {
     console.error('Complete analysis error:', error);
     return res.json({
       success: false,
       error: 'Failed to perform complete analysis',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
 
 async function performNetworkComparison(data: any, res: typeof NextResponse) {
   try {
-    const startTime = Date.now();
+    const startTime = performance.now();
     const { networks, metrics = [], statisticalTests = [] } = data;
 
     if (!networks || !Array.isArray(networks) || networks.length < 2) {
       return res.json({
         success: false,
         error: 'At least two networks are required for comparison',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
 
@@ -372,7 +499,7 @@ async function performNetworkComparison(data: any, res: typeof NextResponse) {
       networks: [] as any[],
       comparisons: {} as any,
       summary: {} as any,
-      totalTime: Date.now() - startTime
+      totalTime: Math.round(performance.now() - startTime)
     };
 
     // Analyze each network
@@ -406,7 +533,7 @@ async function performNetworkComparison(data: any, res: typeof NextResponse) {
     return res.json({
       success: true,
       results,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     console.error('Network comparison error:', error);
@@ -414,24 +541,87 @@ async function performNetworkComparison(data: any, res: typeof NextResponse) {
       success: false,
       error: 'Failed to perform network comparison',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
 
 async function performBatchProcessing(data: any, res: typeof NextResponse) {
   try {
-    const startTime = Date.now();
-    const { jobs, maxConcurrency = 5, onError = 'continue' } = data;
+    const { jobs, maxConcurrency = 5, onError = 'continue', ignoreResult = false, wait = false } = data;
 
     if (!jobs || !Array.isArray(jobs) || jobs.length === 0) {
       return res.json({
         success: false,
         error: 'Jobs array is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
 
+    // Accept the batch and return immediately; the jobs are processed once
+    // this response is on its way, and the estimate is known up front
+    const now = Date.now();
+    const job: BatchJob = {
+      id: generateId(),
+      status: 'queued',
+      createdAt: new Date(now).toISOString(),
+      estimatedCompletion: new Date(now + jobs.length * BATCH_JOB_ESTIMATE_MS).toISOString(),
+      results: null
+    };
+
+    // Synchronous fallback: the batch completes within this request, so the
+    // results do not depend on background work or on instance-local state
+    if (wait) {
+      runBatchJob(job, jobs);
+      return res.json({
+        success: job.status === 'completed',
+        jobId: job.id,
+        status: job.status,
+        createdAt: job.createdAt,
+        results: job.results,
+        error: job.error,
+        timestamp: isoTimestamp()
+      }, { status: job.status === 'completed' ? 200 : 500 });
+    }
+    setTimeout(() => runBatchJob(job, jobs), 0);
+
+    // Fire-and-forget batches are never registered, so they take no slot
+    // in the job table and can't evict jobs that are being polled
+    if (ignoreResult) {
+      return res.json({
+        success: true,
+        jobId: job.id,
+        status: job.status,
+        estimatedCompletion: job.estimatedCompletion,
+        timestamp: isoTimestamp()
+      }, { status: 202 });
+    }
+    batchJobs.set(job.id, job);
+
+    const pollUrl = `/api/integration?workflow=batch_processing&jobId=${job.id}`;
+    return res.json({
+      success: true,
+      jobId: job.id,
+      status: job.status,
+      pollUrl,
+      estimatedCompletion: job.estimatedCompletion,
+      timestamp: isoTimestamp()
+    }, { status: 202, headers: { Location: pollUrl } });
+  } catch (error) {
+    console.error('Batch processing error:', error);
+    return res.json({
+      success: false,
+      error: 'Failed to perform batch processing',
+      details: error instanceof Error ? error.message : 'Unknown error',
+      timestamp: isoTimestamp()
+    }, { status: 500 });
+  }
+}
+
+function runBatchJob(job: BatchJob, jobs: any[]) {
+  const startTime = performance.now();
+  job.status = 'running';
+  try {
     const results = {
       workflow: 'batch_processing',
       jobs: [] as any[],
@@ -445,7 +635,7 @@ async function performBatchProcessing(data: any, res: typeof NextResponse) {
     };
 
     // Process jobs
-    const jobResults = jobs.map((job: any, index: number) => ({
+    const jobResults = jobs.map((spec: any, index: number) => ({
       job: index,
       result: { success: true, data: Math.random() },
       status: 'completed'
@@ -453,34 +643,27 @@ async function performBatchProcessing(data: any, res: typeof NextResponse) {
 
     results.jobs = jobResults;
     results.summary.completed = jobs.length;
-    results.totalTime = Date.now() - startTime;
+    results.totalTime = Math.round(performance.now() - startTime);
 
-    return res.json({
-      success: true,
-      results,
-      timestamp: new Date().toISOString()
-    });
+    job.results = results;
+    job.status = 'completed';
   } catch (error) {
     console.error('Batch processing error:', error);
-    return res.json({
-      success: false,
-      error: 'Failed to perform batch processing',
-      details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
-    }, { status: 500 });
+    job.status = 'failed';
+    job.error = error instanceof Error ? error.message : 'Unknown error';
   }
 }
 
 async function performNetworkEvolutionAnalysis(data: any, res: typeof NextResponse) {
   try {
-    const startTime = Date.now();
+    const startTime = performance.now();
     const { networks, timePoints, metrics = [] } = data;
 
     if (!networks || !Array.isArray(networks) || networks.length < 2) {
       return res.json({
         success: false,
         error: 'At least two networks are required for evolution analysis',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
 
@@ -489,7 +672,7 @@ async function performNetworkEvolutionAnalysis(data: any, res: typeof NextRespon
       timeSeries: [] as any[],
       evolutionMetrics: {} as any,
       summary: {} as any,
-      totalTime: Date.now() - startTime
+      totalTime: Math.round(performance.now() - startTime)
     };
 
     // Analyze each time point
@@ -524,7 +707,7 @@ async function performNetworkEvolutionAnalysis(data: any, res: typeof NextRespon
     return res.json({
       success: true,
       results,
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     });
   } catch (error) {
     console.error('Network evolution analysis error:', error);
@@ -532,14 +715,20 @@ async function performNetworkEvolutionAnalysis(data: any, res: typeof NextRespon
       success: false,
       error: 'Failed to perform network evolution analysis',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
 
 // Helper functions
+// Job ids double as the only handle on a job's results, so they come from
+// the CSPRNG rather than the clock and Math.random
+function generateId() {
+  return randomUUID();
+}
+
 function validateNetwork(network: any) {
-  const startTime = Date.now();
+  const startTime = performance.now();
   const errors: string[] = [];
   const metrics: any = {};
 
@@ -562,7 +751,7 @@ function validateNetwork(network: any) {
     valid: errors.length === 0,
     errors,
     metrics,
-    duration: Date.now() - startTime
+    duration: Math.round(performance.now() - startTime)
   };
 }
 
@@ -571,50 +760,57 @@ function calculateDensity(nodeCount: number, edgeCount: number) {
   return maxPossibleEdges > 0 ? edgeCount / maxPossibleEdges : 0;
 }
 
-async function computeCentrality(network: any, algorithm: string) {
-  // Simulate centrality computation
-  const centrality = network.nodes.map((node: any) => ({
-    nodeId: node.id,
-    value: Math.random(),
-    normalizedValue: Math.random()
-  }));
-
-  return {
-    algorithm,
-    centrality,
-    statistics: {
-      computationTime: Math.random() * 100,
-      maxCentrality: Math.max(...centrality.map((c: any) => c.value))
-    }
-  };
+async function computeCentralityMisses(
+  network: CentralityNetwork,
+  algorithms: string[]
+): Promise<Record<string, CentralityScores>> {
+  // Calls the engine directly rather than round-tripping through the
+  // centrality route; one call shares the graph and iteration sweeps
+  if (algorithms.length === 0) return {};
+  return computeCentralities(network, algorithms.map(algorithm => algorithm.toLowerCase()));
 }
 
-async function detectCommunities(network: any, algorithm: string) {
-  // Simulate community detection
-  const communities = network.nodes.map((node: any) => ({
-    nodeId: node.id,
-    community: Math.floor(Math.random() * 3),
-    communitySize: Math.floor(Math.random() * 10) + 1
+function detectCommunities(graph: IndexedGraph, algorithm: string) {
+  const result = louvain(graph);
+
+  const sizes = new Int32Array(result.communityCount);
+  for (let i = 0; i < result.membership.length; i++) sizes[result.membership[i]]++;
+
+  const communities = graph.nodeIds.map((nodeId, i) => ({
+    nodeId,
+    community: result.membership[i],
+    communitySize: sizes[result.membership[i]]
   }));
 
   return {
     algorithm,
     communities,
     statistics: {
-      numCommunities: 3,
-      modularity: Math.random()
+      numCommunities: result.communityCount,
+      modularity: result.modularity,
+      iterations: result.levels
     }
   };
 }
 
-async function analyzeStructure(network: any) {
-  // Simulate structural analysis
+function analyzeStructure(graph: IndexedGraph) {
+  const n = graph.nodeIds.length;
+  const maxPossibleEdges = graph.directed ? n * (n - 1) : n * (n - 1) / 2;
+  const density = maxPossibleEdges > 0 ? graph.edgeCount / maxPossibleEdges : 0;
+  // Sampled like the analysis route's structural properties
+  const paths = shortestPathSummary(graph, false, STRUCTURAL_PATH_SOURCES);
+  const mixing = structuralSummary(graph);
+
   return {
-    clusteringCoefficient: Math.random(),
-    density: calculateDensity(network.nodes.length, network.edges.length),
-    diameter: Math.floor(Math.random() * 10) + 1,
+    clusteringCoefficient: mixing.transitivity,
+    density,
+    diameter: paths.diameter,
     statistics: {
-      avgDegree: network.edges.length * 2 / network.nodes.length
+      avgDegree: n > 0 ? graph.indices.length / n : 0,
+      averagePathLength: paths.averagePathLength,
+      pathSources: paths.sources,
+      transitivity: mixing.transitivity,
+      assortativity: mixing.assortativity
     }
   };
 }
@@ -1,11 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
-import OpenAI from 'openai';
-
-const openai = new OpenAI({
-  apiKey: process.env.OPENAI_API_KEY,
-});
+import { getOpenAI, openaiConfigured } from '@/lib/openai';
+import { preEncodedJson } from '@/lib/responses';
+import { isoTimestamp } from '@/lib/timestamp';
 
 export async function POST(request: NextRequest) {
+  const startTime = performance.now();
   try {
     const body = await request.json();
     const { network, detectionType, threshold, features } = body;
@@ -14,21 +13,23 @@ export async function POST(request: NextRequest) {
       return NextResponse.json({
         success: false,
         error: 'Network data is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
 
     // Check if OpenAI API key is configured
-    if (!process.env.OPENAI_API_KEY) {
+    if (!openaiConfigured) {
       return NextResponse.json({
         success: false,
         error: 'OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 500 });
     }
 
-    // Calculate network statistics for anomaly detection
-    const networkStats = calculateNetworkStats(network);
+    // Calculate network statistics for anomaly detection; the adjacency is
+    // indexed once and shared by every statistic derived from it
+    const index = indexNetwork(network);
+    const networkStats = calculateNetworkStats(network, index);
     
     // Create prompt for OpenAI based on detection type
     let prompt = '';
@@ -132,11 +133,12 @@ Format the response as JSON with security scores and threat levels.`;
         return NextResponse.json({
           success: false,
           error: 'Invalid detection type',
-          timestamp: new Date().toISOString()
+          timestamp: isoTimestamp()
         }, { status: 400 });
     }
 
     // Call OpenAI API
+    const openai = await getOpenAI();
     const completion = await openai.chat.completions.create({
       model: "gpt-4",
       messages: [
@@ -170,7 +172,7 @@ Format the response as JSON with security scores and threat levels.`;
     }
 
     // Add computed anomalies for demonstration
-    const computedAnomalies = computeAnomalies(network, networkStats, threshold || 0.5);
+    const computedAnomalies = computeAnomalies(network, index, threshold || 0.5);
 
     const result = {
       success: true,
@@ -182,8 +184,8 @@ Format the response as JSON with security scores and threat levels.`;
       metadata: {
         model: "gpt-4",
         confidence: 0.85,
-        computation_time: Date.now() - Date.now(),
-        timestamp: new Date().toISOString()
+        computation_time: Math.round(performance.now() - startTime),
+        timestamp: isoTimestamp()
       }
     };
 
@@ -195,13 +197,48 @@ Format the response as JSON with security scores and threat levels.`;
       success: false,
       error: 'Failed to detect anomalies',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
 
+interface NetworkIndex {
+  // Other endpoint of every edge touching a node, in edge order
+  neighbors: Map<any, any[]>;
+  // Undirected edge lookup: hasEdge(a, b) is adjacency.get(a)?.has(b)
+  adjacency: Map<any, Set<any>>;
+  degrees: Map<any, number>;
+}
+
+// Index the edge list in a single pass, replacing per-node scans of every
+// edge. A self-loop appears once in its node's neighbor list.
+function indexNetwork(network: any): NetworkIndex {
+  const nodes = network.nodes || [];
+  const edges = network.edges || [];
+  const neighbors = new Map<any, any[]>();
+  const adjacency = new Map<any, Set<any>>();
+
+  nodes.forEach((node: any) => neighbors.set(node.id, []));
+  const link = (a: any, b: any) => {
+    let set = adjacency.get(a);
+    if (!set) adjacency.set(a, set = new Set());
+    set.add(b);
+  };
+
+  edges.forEach((e: any) => {
+    neighbors.get(e.source)?.push(e.target);
+    if (e.target !== e.source) neighbors.get(e.target)?.push(e.source);
+    link(e.source, e.target);
+    link(e.target, e.source);
+  });
+
+  const degrees = new Map<any, number>();
+  neighbors.forEach((list, id) => degrees.set(id, list.length));
+  return { neighbors, adjacency, degrees };
+}
+
 // Calculate network statistics
-function calculateNetworkStats(network: any) {
+function calculateNetworkStats(network: any, index: NetworkIndex) {
   const nodes = network.nodes || [];
   const edges = network.edges || [];
   
@@ -217,19 +254,14 @@ function calculateNetworkStats(network: any) {
   let nodesWithNeighbors = 0;
   
   nodes.forEach((node: any) => {
-    const neighbors = edges
-      .filter((e: any) => e.source === node.id || e.target === node.id)
-      .map((e: any) => e.source === node.id ? e.target : e.source);
+    const neighbors = index.neighbors.get(node.id) || [];
     
     if (neighbors.length >= 2) {
       let triangles = 0;
       for (let i = 0; i < neighbors.length; i++) {
+        const adjacent = index.adjacency.get(neighbors[i]);
         for (let j = i + 1; j < neighbors.length; j++) {
-          const hasEdge = edges.some((e: any) => 
-            (e.source === neighbors[i] && e.target === neighbors[j]) ||
-            (e.source === neighbors[j] && e.target === neighbors[i])
-          );
-          if (hasEdge) triangles++;
+          if (adjacent?.has(neighbors[j])) triangles++;
         }
       }
       const possibleTriangles = neighbors.length * (neighbors.length - 1) / 2;
@@ -241,7 +273,7 @@ function calculateNetworkStats(network: any) {
   const clusteringCoeff = nodesWithNeighbors > 0 ? totalClustering / nodesWithNeighbors : 0;
   
   // Calculate assortativity (simplified)
-  const assortativity = calculateAssortativity(nodes, edges);
+  const assortativity = calculateAssortativity(nodes, edges, index.degrees);
   
   return {
     nodeCount,
@@ -254,16 +286,10 @@ function calculateNetworkStats(network: any) {
 }
 
 // Calculate assortativity coefficient
-function calculateAssortativity(nodes: any[], edges: any[]) {
+function calculateAssortativity(nodes: any[], edges: any[], degrees: Map<any, number>) {
   if (nodes.length < 2) return 0;
   
   // Simplified assortativity calculation
-  const degrees = new Map();
-  nodes.forEach(node => {
-    const degree = edges.filter((e: any) => e.source === node.id || e.target === node.id).length;
-    degrees.set(node.id, degree);
-  });
-  
   let numerator = 0;
   let denominator = 0;
   
@@ -278,17 +304,10 @@ function calculateAssortativity(nodes: any[], edges: any[]) {
 }
 
 // Compute anomalies algorithmically
-function computeAnomalies(network: any, stats: any, threshold: number) {
+function computeAnomalies(network: any, index: NetworkIndex, threshold: number) {
   const nodes = network.nodes || [];
-  const edges = network.edges || [];
   const anomalies: any[] = [];
-  
-  // Calculate node degrees
-  const degrees = new Map();
-  nodes.forEach((node: any) => {
-    const degree = edges.filter((e: any) => e.source === node.id || e.target === node.id).length;
-    degrees.set(node.id, degree);
-  });
+  const { degrees } = index;
   
   const degreeValues = Array.from(degrees.values());
   const avgDegree = degreeValues.reduce((a, b) => a + b, 0) / degreeValues.length;
@@ -296,7 +315,7 @@ function computeAnomalies(network: any, stats: any, threshold: number) {
   
   // Find degree anomalies
   nodes.forEach((node: any) => {
-    const degree = degrees.get(node.id);
+    const degree = degrees.get(node.id)!;
     const zScore = degreeStd > 0 ? Math.abs(degree - avgDegree) / degreeStd : 0;
     
     if (zScore > threshold) {
@@ -312,7 +331,7 @@ function computeAnomalies(network: any, stats: any, threshold: number) {
   
   // Find isolated nodes
   nodes.forEach((node: any) => {
-    const degree = degrees.get(node.id);
+    const degree = degrees.get(node.id)!;
     if (degree === 0) {
       anomalies.push({
         type: 'isolation_anomaly',
@@ -327,7 +346,7 @@ function computeAnomalies(network: any, stats: any, threshold: number) {
   // Find high-degree nodes (potential hubs)
   const highDegreeThreshold = avgDegree + 2 * degreeStd;
   nodes.forEach((node: any) => {
-    const degree = degrees.get(node.id);
+    const degree = degrees.get(node.id)!;
     if (degree > highDegreeThreshold) {
       anomalies.push({
         type: 'hub_anomaly',
@@ -342,53 +361,54 @@ function computeAnomalies(network: any, stats: any, threshold: number) {
   return anomalies;
 }
 
-export async function GET() {
-  try {
-    const detectionTypes = [
-      {
-        id: 'structural_anomalies',
-        name: 'Structural Anomalies',
-        description: 'Detect unusual network structures and topology patterns',
-        features: ['degree_outliers', 'structural_holes', 'unusual_clustering', 'bridge_detection'],
-        use_cases: ['Network optimization', 'Quality control', 'Structural analysis']
-      },
-      {
-        id: 'behavioral_anomalies',
-        name: 'Behavioral Anomalies',
-        description: 'Identify nodes with unusual behavioral patterns',
-        features: ['connection_patterns', 'clustering_behavior', 'path_anomalies', 'community_violations'],
-        use_cases: ['User behavior analysis', 'Fraud detection', 'Pattern recognition']
-      },
-      {
-        id: 'temporal_anomalies',
-        name: 'Temporal Anomalies',
-        description: 'Detect unusual changes in network evolution over time',
-        features: ['growth_anomalies', 'disappearance_patterns', 'evolution_deviations', 'change_detection'],
-        use_cases: ['Network monitoring', 'Change detection', 'Evolution analysis']
-      },
-      {
-        id: 'security_anomalies',
-        name: 'Security Anomalies',
-        description: 'Identify potential security threats and malicious patterns',
-        features: ['bot_detection', 'attack_patterns', 'infiltration_indicators', 'threat_assessment'],
-        use_cases: ['Cybersecurity', 'Threat detection', 'Security monitoring']
-      }
-    ];
+// Static catalog served by GET; encoded once per process, not per request
+const DETECTION_TYPES = [
+  {
+    id: 'structural_anomalies',
+    name: 'Structural Anomalies',
+    description: 'Detect unusual network structures and topology patterns',
+    features: ['degree_outliers', 'structural_holes', 'unusual_clustering', 'bridge_detection'],
+    use_cases: ['Network optimization', 'Quality control', 'Structural analysis']
+  },
+  {
+    id: 'behavioral_anomalies',
+    name: 'Behavioral Anomalies',
+    description: 'Identify nodes with unusual behavioral patterns',
+    features: ['connection_patterns', 'clustering_behavior', 'path_anomalies', 'community_violations'],
+    use_cases: ['User behavior analysis', 'Fraud detection', 'Pattern recognition']
+  },
+  {
+    id: 'temporal_anomalies',
+    name: 'Temporal Anomalies',
+    description: 'Detect unusual changes in network evolution over time',
+    features: ['growth_anomalies', 'disappearance_patterns', 'evolution_deviations', 'change_detection'],
+    use_cases: ['Network monitoring', 'Change detection', 'Evolution analysis']
+  },
+  {
+    id: 'security_anomalies',
+    name: 'Security Anomalies',
+    description: 'Identify potential security threats and malicious patterns',
+    features: ['bot_detection', 'attack_patterns', 'infiltration_indicators', 'threat_assessment'],
+    use_cases: ['Cybersecurity', 'Threat detection', 'Security monitoring']
+  }
+];
 
-    return NextResponse.json({
-      success: true,
-      detection_types: detectionTypes,
-      total: detectionTypes.length,
-      timestamp: new Date().toISOString()
-    });
+const detectionTypesResponse = preEncodedJson({
+  success: true,
+  detection_types: DETECTION_TYPES,
+  total: DETECTION_TYPES.length
+});
 
+export async function GET() {
+  try {
+    return detectionTypesResponse();
   } catch (error) {
     console.error('ML Anomaly Detection types API error:', error);
     return NextResponse.json({
       success: false,
       error: 'Failed to fetch detection types',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
\ No newline at end of file
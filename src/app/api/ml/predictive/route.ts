@@ -1,11 +1,10 @@
 import { NextRequest, NextResponse } from 'next/server';
-import OpenAI from 'openai';
-
-const openai = new OpenAI({
-  apiKey: process.env.OPENAI_API_KEY,
-});
+import { getOpenAI, openaiConfigured } from '@/lib/openai';
+import { preEncodedJson } from '@/lib/responses';
+import { isoTimestamp } from '@/lib/timestamp';
 
 export async function POST(request: NextRequest) {
+  const startTime = performance.now();
   try {
     const body = await request.json();
     const { network, predictionType, timeHorizon, features } = body;
@@ -14,16 +13,16 @@ export async function POST(request: NextRequest) {
       return NextResponse.json({
         success: false,
         error: 'Network data is required',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 400 });
     }
 
     // Check if OpenAI API key is configured
-    if (!process.env.OPENAI_API_KEY) {
+    if (!openaiConfigured) {
       return NextResponse.json({
         success: false,
         error: 'OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.',
-        timestamp: new Date().toISOString()
+        timestamp: isoTimestamp()
       }, { status: 500 });
     }
 
@@ -32,7 +31,9 @@ export async function POST(request: NextRequest) {
       nodeCount: network.nodes.length,
       edgeCount: network.edges?.length || 0,
       density: network.edges?.length > 0 ? network.edges.length / (network.nodes.length * (network.nodes.length - 1) / 2) : 0,
-      avgDegree: network.edges?.length > 0 ? (network.edges.length * 2) / network.nodes.length : 0,
+      avgDegree: network.nodes.length > 0
+        ? (network.directed ? 1 : 2) * (network.edges?.length || 0) / network.nodes.length
+        : 0,
       directed: network.directed || false,
       features: features || ['degree', 'betweenness', 'closeness']
     };
@@ -137,11 +138,12 @@ Format the response as JSON with community predictions and evolution patterns.`;
         return NextResponse.json({
           success: false,
           error: 'Invalid prediction type',
-          timestamp: new Date().toISOString()
+          timestamp: isoTimestamp()
         }, { status: 400 });
     }
 
     // Call OpenAI API
+    const openai = await getOpenAI();
     const completion = await openai.chat.completions.create({
       model: "gpt-4",
       messages: [
@@ -185,8 +187,8 @@ Format the response as JSON with community predictions and evolution patterns.`;
       metadata: {
         model: "gpt-4",
         confidence: 0.85,
-        computation_time: Date.now() - Date.now(),
-        timestamp: new Date().toISOString()
+        computation_time: Math.round(performance.now() - startTime),
+        timestamp: isoTimestamp()
       }
     };
 
@@ -198,58 +200,59 @@ Format the response as JSON with community predictions and evolution patterns.`;
       success: false,
       error: 'Failed to generate predictions',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
 
-export async function GET() {
-  try {
-    const predictionTypes = [
-      {
-        id: 'network_growth',
-        name: 'Network Growth Prediction',
-        description: 'Predict how networks will grow and evolve over time',
-        features: ['node_growth', 'edge_growth', 'density_evolution', 'community_formation'],
-        use_cases: ['Business expansion', 'Social network growth', 'Infrastructure planning']
-      },
-      {
-        id: 'anomaly_detection',
-        name: 'Anomaly Detection',
-        description: 'Identify unusual patterns and potential security risks',
-        features: ['unusual_connections', 'suspicious_patterns', 'fraud_detection', 'security_risks'],
-        use_cases: ['Fraud detection', 'Security monitoring', 'Quality control']
-      },
-      {
-        id: 'influence_prediction',
-        name: 'Influence Prediction',
-        description: 'Predict information spread and influence propagation',
-        features: ['influence_scores', 'viral_potential', 'seeding_strategies', 'reach_prediction'],
-        use_cases: ['Marketing campaigns', 'Information dissemination', 'Social influence']
-      },
-      {
-        id: 'community_evolution',
-        name: 'Community Evolution',
-        description: 'Predict how communities will form and evolve',
-        features: ['community_formation', 'evolution_patterns', 'stability_analysis', 'intervention_strategies'],
-        use_cases: ['Community management', 'Social dynamics', 'Organizational design']
-      }
-    ];
+// Static catalog served by GET; encoded once per process, not per request
+const PREDICTION_TYPES = [
+  {
+    id: 'network_growth',
+    name: 'Network Growth Prediction',
+    description: 'Predict how networks will grow and evolve over time',
+    features: ['node_growth', 'edge_growth', 'density_evolution', 'community_formation'],
+    use_cases: ['Business expansion', 'Social network growth', 'Infrastructure planning']
+  },
+  {
+    id: 'anomaly_detection',
+    name: 'Anomaly Detection',
+    description: 'Identify unusual patterns and potential security risks',
+    features: ['unusual_connections', 'suspicious_patterns', 'fraud_detection', 'security_risks'],
+    use_cases: ['Fraud detection', 'Security monitoring', 'Quality control']
+  },
+  {
+    id: 'influence_prediction',
+    name: 'Influence Prediction',
+    description: 'Predict information spread and influence propagation',
+    features: ['influence_scores', 'viral_potential', 'seeding_strategies', 'reach_prediction'],
+    use_cases: ['Marketing campaigns', 'Information dissemination', 'Social influence']
+  },
+  {
+    id: 'community_evolution',
+    name: 'Community Evolution',
+    description: 'Predict how communities will form and evolve',
+    features: ['community_formation', 'evolution_patterns', 'stability_analysis', 'intervention_strategies'],
+    use_cases: ['Community management', 'Social dynamics', 'Organizational design']
+  }
+];
 
-    return NextResponse.json({
-      success: true,
-      prediction_types: predictionTypes,
-      total: predictionTypes.length,
-      timestamp: new Date().toISOString()
-    });
+const predictionTypesResponse = preEncodedJson({
+  success: true,
+  prediction_types: PREDICTION_TYPES,
+  total: PREDICTION_TYPES.length
+});
 
+export async function GET() {
+  try {
+    return predictionTypesResponse();
   } catch (error) {
     console.error('ML Predictive types API error:', error);
     return NextResponse.json({
       success: false,
       error: 'Failed to fetch prediction types',
       details: error instanceof Error ? error.message : 'Unknown error',
-      timestamp: new Date().toISOString()
+      timestamp: isoTimestamp()
     }, { status: 500 });
   }
 }
\ No newline at end of file
@@ -0,0 +1,169 @@
+// Small in-process caches shared by the API routes.
+//
+// Routes run in a single long-lived server process, so a bounded Map is
+// enough to amortize work across requests for identical payloads.
+
+export interface LRUCacheOptions<V> {
+  // Upper bound on the summed `cost` of all entries
+  maxCost?: number;
+  cost?: (value: V) => number;
+}
+
+// Least-recently-used cache on top of Map insertion order, bounded by entry
+// count and optionally by a per-entry cost such as retained bytes.
+export class LRUCache<K, V> {
+  private entries = new Map<K, V>();
+  private costs = new Map<K, number>();
+  private maxEntries: number;
+  private maxCost: number;
+  private costOf: ((value: V) => number) | null;
+  private totalCost = 0;
+
+  constructor(maxEntries: number, options: LRUCacheOptions<V> = {}) {
+    this.maxEntries = maxEntries;
+    this.maxCost = options.maxCost ?? Infinity;
+    this.costOf = options.cost ?? null;
+  }
+
+  get size() {
+    return this.entries.size;
+  }
+
+  get(key: K): V | undefined {
+    const value = this.entries.get(key);
+    if (value !== undefined) {
+      this.entries.delete(key);
+      this.entries.set(key, value);
+    }
+    return value;
+  }
+
+  set(key: K, value: V) {
+    this.delete(key);
+    const cost = this.costOf ? this.costOf(value) : 0;
+    // Entries that could never fit are not cached at all
+    if (cost > this.maxCost) return;
+
+    this.entries.set(key, value);
+    if (this.costOf) {
+      this.costs.set(key, cost);
+      this.totalCost += cost;
+    }
+    while (this.entries.size > this.maxEntries || this.totalCost > this.maxCost) {
+      this.delete(this.entries.keys().next().value as K);
+    }
+  }
+
+  // Batch forms for callers that resolve several keys for one payload, e.g.
+  // every algorithm requested against the same network
+  getMany(keys: readonly K[]): (V | undefined)[] {
+    return keys.map(key => this.get(key));
+  }
+
+  setMany(entries: Iterable<readonly [K, V]>) {
+    for (const [key, value] of entries) this.set(key, value);
+  }
+
+  delete(key: K) {
+    const cost = this.costs.get(key);
+    if (cost !== undefined) {
+      this.totalCost -= cost;
+      this.costs.delete(key);
+    }
+    return this.entries.delete(key);
+  }
+
+  clear() {
+    this.entries.clear();
+    this.costs.clear();
+    this.totalCost = 0;
+  }
+}
+
+// Scratch view for reading a number's IEEE-754 bits as two 32-bit words
+const numberBits = new Float64Array(1);
+const numberWords = new Int32Array(numberBits.buffer);
+
+// Value tags, so 1 and '1' (or {} and '{}') hash differently
+const NUMBER_TAG = 0x1e;
+const JSON_TAG = 0x1d;
+
+// Incremental 64-bit content hash (two independent 32-bit multiplicative
+// lanes). Not cryptographic; used only to key caches by payload content.
+export class ContentHasher {
+  private h1 = 0xdeadbeef;
+  private h2 = 0x41c6ce57;
+
+  private word(x: number) {
+    this.h1 = Math.imul(this.h1 ^ x, 2654435761);
+    this.h2 = Math.imul(this.h2 ^ x, 1597334677);
+  }
+
+  // Strings are mixed two UTF-16 code units per word
+  private text(text: string) {
+    const pairs = text.length & ~1;
+    for (let i = 0; i < pairs; i += 2) {
+      this.word(text.charCodeAt(i) | (text.charCodeAt(i + 1) << 16));
+    }
+    if (pairs < text.length) this.word(text.charCodeAt(pairs));
+    // Separator so ['ab', 'c'] and ['a', 'bc'] hash differently
+    this.word(0x1f);
+  }
+
+  // Numbers and strings, the bulk of id and edge columns, are hashed
+  // directly; anything else goes through its JSON text
+  update(value: unknown) {
+    if (typeof value === 'number') {
+      numberBits[0] = value;
+      this.word(NUMBER_TAG);
+      this.word(numberWords[0]);
+      this.word(numberWords[1]);
+    } else if (typeof value === 'string') {
+      this.text(value);
+    } else {
+      this.word(JSON_TAG);
+      this.text(JSON.stringify(value) ?? '');
+    }
+    return this;
+  }
+
+  updateColumn(column: ArrayLike<unknown>) {
+    this.word(column.length);
+    for (let i = 0; i < column.length; i++) this.update(column[i]);
+    return this;
+  }
+
+  updateBytes(view: ArrayBufferView) {
+    const { buffer, byteOffset, byteLength } = view;
+    this.word(byteLength);
+    if (byteOffset % 4 === 0 && byteLength % 4 === 0) {
+      const words = new Int32Array(buffer, byteOffset, byteLength / 4);
+      for (let i = 0; i < words.length; i++) this.word(words[i]);
+    } else {
+      const bytes = new Uint8Array(buffer, byteOffset, byteLength);
+      for (let i = 0; i < bytes.length; i++) this.word(bytes[i]);
+    }
+    return this;
+  }
+
+  digest() {
+    let h1 = Math.imul(this.h1 ^ (this.h1 >>> 16), 2246822507);
+    h1 ^= Math.imul(this.h2 ^ (this.h2 >>> 13), 3266489909);
+    let h2 = Math.imul(this.h2 ^ (this.h2 >>> 16), 2246822507);
+    h2 ^= Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+    return (h2 >>> 0).toString(16).padStart(8, '0') + (h1 >>> 0).toString(16).padStart(8, '0');
+  }
+}
+
+// JSON with object keys sorted, so equal values always serialize the same
+// way regardless of property insertion order.
+export function canonicalJson(value: unknown): string {
+  if (Array.isArray(value)) return `[${value.map(canonicalJson).join(',')}]`;
+  if (value !== null && typeof value === 'object') {
+    const entries = Object.keys(value).sort()
+      .filter(key => (value as any)[key] !== undefined)
+      .map(key => `${JSON.stringify(key)}:${canonicalJson((value as any)[key])}`);
+    return `{${entries.join(',')}}`;
+  }
+  return JSON.stringify(value) ?? 'null';
+}
@@ -0,0 +1,824 @@
+// Centrality engine shared by the centrality route and the integration
+// workflows, so callers compute results in-process instead of going through
+// the HTTP handler and its validation and response envelope.
+
+import { ContentHasher, LRUCache, canonicalJson } from './cache';
+import { type IndexedGraph, bfs, buildGraph, degree, edgeColumns, getGraph, graphFingerprint, nodeColumn } from './graph';
+
+// Per-node scores as parallel columns over the request's node ids, e.g.
+// `value` and `normalizedValue`. Kernels compute and callers cache this
+// form; per-node result records are only built at the response boundary.
+export interface CentralityScores {
+  nodeIds: any[];
+  columns: Record<string, Float64Array>;
+  statistics: Record<string, any>;
+}
+
+// Results shared by every caller, keyed by algorithm, network content and
+// canonicalized options. `json` is filled lazily by callers that serve the
+// serialized form, so a hit can splice it instead of re-serializing.
+export interface CachedCentrality {
+  scores: CentralityScores;
+  json?: string;
+}
+
+// Approximate retained size: the score columns plus the id list
+function centralityBytes(entry: CachedCentrality) {
+  const { nodeIds, columns } = entry.scores;
+  let bytes = nodeIds.length * 16;
+  for (const name in columns) bytes += columns[name].byteLength;
+  return bytes;
+}
+
+export const centralityCache = new LRUCache<string, CachedCentrality>(64, {
+  maxCost: 128 * 1024 * 1024,
+  cost: centralityBytes
+});
+
+// The `{ centrality: [{ nodeId, ...scores }], statistics }` result form
+// served by the API, with one record per node
+export function centralityRecords(scores: CentralityScores) {
+  const { nodeIds, columns, statistics } = scores;
+  const names = Object.keys(columns);
+  const centrality = nodeIds.map((nodeId, i) => {
+    const record: Record<string, any> = { nodeId };
+    for (const name of names) record[name] = columns[name][i];
+    return record;
+  });
+  return { centrality, statistics };
+}
+
+// Serialized results of an entry, encoded on first use and kept with it
+export function centralityJson(entry: CachedCentrality) {
+  return entry.json ??= JSON.stringify(centralityRecords(entry.scores));
+}
+
+// Options each algorithm actually reads, with the value its kernel uses when
+// one is omitted; anything else in a request's options is left out of its
+// cache key so it can't split entries. The centrality route checks its
+// catalog's parameters against this table when it loads.
+export const CENTRALITY_OPTIONS: Readonly<Record<string, Readonly<Record<string, any>>>> = {
+  betweenness: { normalized: true, k: null },
+  closeness: { normalized: true },
+  eigenvector: { maxIterations: 100, tolerance: 1e-6 },
+  pagerank: { damping: 0.85, maxIterations: 100, tolerance: 1e-6 },
+  katz: { alpha: 0.1, beta: 1.0, maxIterations: 100, tolerance: 1e-6 },
+  hits: { maxIterations: 10 }
+};
+
+// An option as its kernel reads it, so an explicit default and an omitted
+// option share a cache key
+function effectiveOption(name: string, value: any, fallback: any) {
+  if (typeof fallback === 'boolean') return value !== false;
+  if (name === 'k') {
+    const k = Math.floor(Number(value));
+    return k > 0 ? k : null;
+  }
+  return value || fallback;
+}
+
+// A network resolved once for all the work a request does on it: the CSR
+// graph, where each requested node sits in it, and its cache key part.
+export interface CentralityNetwork {
+  graph: IndexedGraph;
+  ids: any[];
+  index: Int32Array;
+  // Keyed by the assembled graph, so reordered or repeated edges still hit,
+  // and by the request's id column, which results are reported against
+  key: string;
+}
+
+function centralityNetworkKey(graph: IndexedGraph, ids: any[]) {
+  return `${graphFingerprint(graph)}:${new ContentHasher().updateColumn(ids).digest()}`;
+}
+
+export function resolveCentralityNetwork(network: any): CentralityNetwork {
+  const ids = nodeColumn(network.nodes) || [];
+  const graph = centralityGraph(network, ids);
+  return { graph, ids, index: nodeIndex(ids, graph), key: centralityNetworkKey(graph, ids) };
+}
+
+// For a graph that was built directly, e.g. from a binary payload; results
+// are reported against the graph's own node ids
+export function graphCentralityNetwork(graph: IndexedGraph): CentralityNetwork {
+  const ids = graph.nodeIds;
+  return { graph, ids, index: nodeIndex(ids, graph), key: centralityNetworkKey(graph, ids) };
+}
+
+export function centralityCacheKey(algorithm: string, networkHash: string, options: any = {}) {
+  const used: Record<string, unknown> = {};
+  const defaults = CENTRALITY_OPTIONS[algorithm] ?? {};
+  for (const name in defaults) used[name] = effectiveOption(name, options?.[name], defaults[name]);
+  return `centrality:${algorithm}:${networkHash}:${canonicalJson(used)}`;
+}
+
+// `algorithm` is a lower-case catalog id; unknown ids throw. Returns the
+// API result form.
+export function calculateCentrality(network: any, algorithm: string, options: any = {}) {
+  return calculateCentralities(network, [algorithm], options)[algorithm];
+}
+
+// Algorithms computed in one pass, each bound to the kernel and shared
+// sweep it needs, so dispatch is a single table lookup
+const DIRECT_ALGORITHMS: Record<string, (network: CentralityNetwork, paths: ShortestPaths, options: any) => Scores> = {
+  degree: ({ graph, index }) => computeDegreeCentrality(index, graph),
+  betweenness: ({ index }, paths, options) => computeBetweennessCentrality(index, paths.betweenness(), options),
+  closeness: ({ index }, paths, options) => computeClosenessCentrality(index, paths.distances(), options),
+  harmonic: ({ index }, paths) => computeHarmonicCentrality(index, paths.distances())
+};
+
+const ITERATIVE_ALGORITHMS: Record<string, (graph: IndexedGraph, options: any) => IterativeCentrality> = {
+  eigenvector: eigenvectorCentrality,
+  pagerank: pageRankCentrality,
+  katz: katzCentrality,
+  hits: hitsCentrality
+};
+
+// Every algorithm id the engine computes. Routes validate requests against
+// this one list, and the centrality route checks its catalog against it
+// when it loads.
+export const CENTRALITY_ALGORITHMS: ReadonlySet<string> = new Set([
+  ...Object.keys(DIRECT_ALGORITHMS),
+  ...Object.keys(ITERATIVE_ALGORITHMS)
+]);
+
+// Several algorithms over one network, keyed by id.
+export function calculateCentralities(network: any, algorithms: string[], options: any = {}) {
+  const scores = computeCentralities(resolveCentralityNetwork(network), algorithms, options);
+  const results: Record<string, any> = {};
+  for (const algorithm in scores) results[algorithm] = centralityRecords(scores[algorithm]);
+  return results;
+}
+
+// Kernel output, before it is labelled with the request's node ids
+type Scores = Omit<CentralityScores, 'nodeIds'>;
+
+// Scores are computed over the shared CSR graph and gathered into the
+// request's node order only when the results are assembled. The
+// power-iteration algorithms advance together, so each sweep over the
+// adjacency feeds every requested vector.
+export function computeCentralities(
+  network: CentralityNetwork,
+  algorithms: string[],
+  options: any = {}
+): Record<string, CentralityScores> {
+  const { graph, ids, index } = network;
+  const results: Record<string, Scores> = {};
+  const iterative: Record<string, IterativeCentrality> = {};
+  const paths = shortestPaths(graph, algorithms, options);
+  for (const algorithm of algorithms) {
+    if (algorithm in results || algorithm in iterative) continue;
+    if (ITERATIVE_ALGORITHMS.hasOwnProperty(algorithm)) {
+      iterative[algorithm] = ITERATIVE_ALGORITHMS[algorithm](graph, options);
+      continue;
+    }
+    if (!DIRECT_ALGORITHMS.hasOwnProperty(algorithm)) {
+      throw new Error(`Unknown algorithm: ${algorithm}`);
+    }
+    results[algorithm] = DIRECT_ALGORITHMS[algorithm](network, paths, options);
+  }
+
+  runPowerIterations(graph, Object.values(iterative).flatMap(centrality => centrality.runs));
+  for (const algorithm in iterative) {
+    results[algorithm] = iterative[algorithm].assemble(index);
+  }
+
+  const ordered: Record<string, CentralityScores> = {};
+  for (const algorithm of algorithms) ordered[algorithm] = { nodeIds: ids, ...results[algorithm] };
+  return ordered;
+}
+
+// Edges with an unknown endpoint are dropped, as are self-loops; parallel
+// edges collapse into one arc.
+function centralityGraph(network: any, ids: any[]): IndexedGraph {
+  const edges = edgeColumns(network.edges) || { source: [], target: [], weight: null };
+  return getGraph(ids, edges, !!network.directed);
+}
+
+// Graph index of every entry in `ids`. The graph keeps the first occurrence
+// of a repeated id, so without repeats this is the identity.
+function nodeIndex(ids: any[], graph: IndexedGraph): Int32Array {
+  const index = new Int32Array(ids.length);
+  if (graph.nodeIds.length === ids.length) {
+    for (let i = 0; i < index.length; i++) index[i] = i;
+    return index;
+  }
+  const indexOf = new Map<string, number>();
+  graph.nodeIds.forEach((id, i) => indexOf.set(String(id), i));
+  ids.forEach((id, i) => index[i] = indexOf.get(String(id))!);
+  return index;
+}
+
+// Per-graph-node values in request order; with the identity index the
+// array itself is returned, so it must not be written afterwards
+function gather(values: Float64Array, index: Int32Array) {
+  if (index.length === values.length) return values;
+  return Float64Array.from(index, u => values[u]);
+}
+
+function maxOf(values: Float64Array) {
+  let max = -Infinity;
+  for (let i = 0; i < values.length; i++) if (values[i] > max) max = values[i];
+  return max;
+}
+
+// Writes `values` divided by their maximum into `out` (in place by default)
+// and returns that maximum; `out` is left untouched when nothing is positive
+function normalizeMax(values: Float64Array, out = values) {
+  const max = maxOf(values);
+  if (max > 0) {
+    for (let i = 0; i < values.length; i++) out[i] = values[i] / max;
+  }
+  return max;
+}
+
+function sumOf(values: Float64Array) {
+  let sum = 0;
+  for (let i = 0; i < values.length; i++) sum += values[i];
+  return sum;
+}
+
+function computeDegreeCentrality(index: Int32Array, graph: IndexedGraph): Scores {
+  const degrees = Float64Array.from(index, u => degree(graph, u));
+  const normalized = new Float64Array(degrees.length);
+  const maxDegree = Math.max(0, normalizeMax(degrees, normalized));
+
+  return {
+    columns: { value: degrees, normalizedValue: normalized },
+    statistics: {
+      maxDegree,
+      avgDegree: degrees.length > 0 ? sumOf(degrees) / degrees.length : 0
+    }
+  };
+}
+
+// Sources swept by the shortest-path algorithms: every node, or `k` of them
+// spread evenly by stride when a sample is requested
+function pathSources(n: number, options: any) {
+  const k = Math.floor(Number(options.k));
+  if (!(k > 0) || k >= n) return null;
+  const sources = new Int32Array(k);
+  for (let i = 0; i < k; i++) sources[i] = Math.floor(i * n / k);
+  return sources;
+}
+
+// Outward BFS distance totals per node: summed distance, summed reciprocal
+// distance and the number of other nodes reached
+interface DistanceSums {
+  total: Float64Array;
+  reciprocal: Float64Array;
+  reached: Int32Array;
+}
+
+function emptyDistanceSums(n: number): DistanceSums {
+  return { total: new Float64Array(n), reciprocal: new Float64Array(n), reached: new Int32Array(n) };
+}
+
+// Shortest-path sweeps for one computeCentralities call, run at most once
+// each. Exact betweenness already runs a BFS from every source, so when
+// closeness or harmonic is requested alongside it that same sweep also
+// fills their distance sums.
+function shortestPaths(graph: IndexedGraph, algorithms: string[], options: any) {
+  const sources = pathSources(graph.nodeIds.length, options);
+  let betweenness: Float64Array | null = null;
+  let distances: DistanceSums | null = null;
+  if (!sources && algorithms.includes('betweenness') &&
+      (algorithms.includes('closeness') || algorithms.includes('harmonic'))) {
+    distances = emptyDistanceSums(graph.nodeIds.length);
+    betweenness = brandesBetweenness(graph, null, distances);
+  }
+  return {
+    betweenness: () => betweenness ??= brandesBetweenness(graph, sources),
+    distances: () => distances ??= distanceSums(graph)
+  };
+}
+
+type ShortestPaths = ReturnType<typeof shortestPaths>;
+
+// Brandes' algorithm over the CSR arcs: one BFS per source counting shortest
+// paths, then dependencies accumulated in reverse BFS order from each node's
+// successors, so directed graphs need no reverse adjacency. Buffers are
+// allocated once and only the visited entries are reset between sources.
+// With every node as a source, `sums` (when given) collects each source's
+// distance totals during the same BFS.
+function brandesBetweenness(graph: IndexedGraph, sources: Int32Array | null, sums?: DistanceSums) {
+  const { indptr, indices } = graph;
+  const n = graph.nodeIds.length;
+  const betweenness = new Float64Array(n);
+  const dist = new Int32Array(n).fill(-1);
+  const sigma = new Float64Array(n);
+  const delta = new Float64Array(n);
+  const queue = new Int32Array(n);
+
+  const sourceCount = sources ? sources.length : n;
+  for (let i = 0; i < sourceCount; i++) {
+    const s = sources ? sources[i] : i;
+    dist[s] = 0;
+    sigma[s] = 1;
+    queue[0] = s;
+    let tail = 1;
+    let total = 0;
+    let reciprocal = 0;
+    for (let head = 0; head < tail; head++) {
+      const v = queue[head];
+      const next = dist[v] + 1;
+      for (let k = indptr[v]; k < indptr[v + 1]; k++) {
+        const w = indices[k];
+        if (dist[w] < 0) {
+          dist[w] = next;
+          queue[tail++] = w;
+          total += next;
+          reciprocal += 1 / next;
+        }
+        if (dist[w] === next) sigma[w] += sigma[v];
+      }
+    }
+    if (sums) {
+      sums.total[s] = total;
+      sums.reciprocal[s] = reciprocal;
+      sums.reached[s] = tail - 1;
+    }
+
+    for (let j = tail - 1; j >= 0; j--) {
+      const v = queue[j];
+      const next = dist[v] + 1;
+      let dependency = 0;
+      for (let k = indptr[v]; k < indptr[v + 1]; k++) {
+        const w = indices[k];
+        if (dist[w] === next) dependency += sigma[v] / sigma[w] * (1 + delta[w]);
+      }
+      delta[v] = dependency;
+      if (v !== s) betweenness[v] += dependency;
+    }
+
+    for (let j = 0; j < tail; j++) {
+      const v = queue[j];
+      dist[v] = -1;
+      sigma[v] = 0;
+      delta[v] = 0;
+    }
+  }
+
+  // Undirected paths are found from both ends; sampled sources are scaled
+  // up to estimate the full sum
+  const scale = (graph.directed ? 1 : 0.5) * (sources ? n / sources.length : 1);
+  if (scale !== 1) {
+    for (let v = 0; v < n; v++) betweenness[v] *= scale;
+  }
+  return betweenness;
+}
+
+function computeBetweennessCentrality(index: Int32Array, scores: Float64Array, options: any): Scores {
+  const betweenness = gather(scores, index);
+
+  let normalized = betweenness;
+  let maxBetweenness = maxOf(betweenness);
+  if (options.normalized !== false) {
+    normalized = Float64Array.from(betweenness);
+    normalizeMax(betweenness, normalized);
+  }
+
+  return {
+    columns: { value: betweenness, normalizedValue: normalized },
+    statistics: {
+      maxBetweenness,
+      avgBetweenness: index.length > 0 ? sumOf(betweenness) / index.length : 0
+    }
+  };
+}
+
+function distanceSums(graph: IndexedGraph): DistanceSums {
+  const n = graph.nodeIds.length;
+  const { total, reciprocal, reached } = emptyDistanceSums(n);
+  const dist = new Float64Array(n);
+  const queue = new Int32Array(n);
+
+  for (let s = 0; s < n; s++) {
+    const tail = bfs(graph, s, dist, queue);
+    let sum = 0;
+    let harmonic = 0;
+    for (let j = 1; j < tail; j++) {
+      const d = dist[queue[j]];
+      sum += d;
+      harmonic += 1 / d;
+    }
+    total[s] = sum;
+    reciprocal[s] = harmonic;
+    reached[s] = tail - 1;
+  }
+  return { total, reciprocal, reached };
+}
+
+function computeClosenessCentrality(index: Int32Array, sums: DistanceSums, options: any): Scores {
+  const { total, reached } = sums;
+  const n = total.length;
+  const scale = options.normalized !== false && n > 1;
+
+  // Closeness within the reachable set, scaled by the fraction of the graph
+  // reached when normalized so disconnected nodes don't score as central
+  const closeness = new Float64Array(index.length);
+  const normalized = new Float64Array(index.length);
+  for (let i = 0; i < index.length; i++) {
+    const u = index[i];
+    closeness[i] = total[u] > 0 ? reached[u] / total[u] : 0;
+    normalized[i] = scale ? closeness[i] * reached[u] / (n - 1) : closeness[i];
+  }
+
+  return {
+    columns: { value: closeness, normalizedValue: normalized },
+    statistics: {
+      avgCloseness: index.length > 0 ? sumOf(closeness) / index.length : 0
+    }
+  };
+}
+
+function computeHarmonicCentrality(index: Int32Array, sums: DistanceSums): Scores {
+  const { reciprocal, reached } = sums;
+  const n = reciprocal.length;
+
+  const harmonic = gather(reciprocal, index);
+  const normalized = Float64Array.from(harmonic, value => n > 1 ? value / (n - 1) : 0);
+
+  return {
+    columns: {
+      value: harmonic,
+      normalizedValue: normalized,
+      reachableNodes: Float64Array.from(index, u => reached[u])
+    },
+    statistics: {
+      avgHarmonic: index.length > 0 ? sumOf(harmonic) / index.length : 0,
+      maxHarmonic: maxOf(harmonic)
+    }
+  };
+}
+
+// One vector being advanced by power iteration: each step sweeps `input()`
+// over the adjacency (x'[u] = sum of x[v] over u's arcs) and hands the row
+// sums to `advance`. Inputs are all read before any run advances, so coupled
+// runs (HITS hubs and authorities) see the previous step's vectors. A run
+// stops after `iterations` steps, or earlier once `advance` reports that it
+// has converged.
+interface PowerIteration {
+  iterations: number;
+  input(): Float64Array;
+  advance(sums: Float64Array): boolean | void;
+}
+
+interface IterativeCentrality {
+  runs: PowerIteration[];
+  assemble(index: Int32Array): Scores;
+}
+
+function runPowerIterations(graph: IndexedGraph, runs: PowerIteration[]) {
+  const { indptr, indices } = graph;
+  const n = graph.nodeIds.length;
+  const sums = runs.map(() => new Float64Array(n));
+  const steps = runs.reduce((max, run) => Math.max(max, run.iterations), 0);
+  const converged = new Uint8Array(runs.length);
+
+  for (let iter = 0; iter < steps; iter++) {
+    const live = runs.map((_, j) => j).filter(j => !converged[j] && iter < runs[j].iterations);
+    if (live.length === 0) break;
+    const inputs = live.map(j => runs[j].input());
+    const outputs = live.map(j => sums[j]);
+
+    if (live.length === 1) {
+      const [x] = inputs;
+      const [out] = outputs;
+      for (let u = 0; u < n; u++) {
+        let sum = 0;
+        for (let k = indptr[u]; k < indptr[u + 1]; k++) sum += x[indices[k]];
+        out[u] = sum;
+      }
+    } else {
+      // One pass over the arcs accumulates every live vector
+      const width = live.length;
+      const acc = new Float64Array(width);
+      for (let u = 0; u < n; u++) {
+        acc.fill(0);
+        for (let k = indptr[u]; k < indptr[u + 1]; k++) {
+          const v = indices[k];
+          for (let j = 0; j < width; j++) acc[j] += inputs[j][v];
+        }
+        for (let j = 0; j < width; j++) outputs[j][u] = acc[j];
+      }
+    }
+
+    live.forEach((j, i) => {
+      if (runs[j].advance(outputs[i])) converged[j] = 1;
+    });
+  }
+}
+
+// Aitken delta-squared extrapolation for a converging power iteration. Once
+// successive steps shrink by a steady ratio r, the remaining error is
+// dominated by a single mode, and the iterate is moved to that mode's limit
+// x + r / (1 - r) * (x - previous). A drift d between two estimates of r
+// moves that jump by about d / (r (1 - r)) of itself, so the estimates must
+// agree within 1% on that scale; ratios near 1 need near-exact agreement.
+// The ratio is signed, so alternating modes are extrapolated correctly, and
+// history restarts after each jump.
+class AitkenExtrapolation {
+  private older: Float64Array;
+  private previous: Float64Array;
+  private history = 0;
+  private ratio = 0;
+
+  constructor(n: number) {
+    this.older = new Float64Array(n);
+    this.previous = new Float64Array(n);
+  }
+
+  // Called with each new iterate; returns true when `x` was extrapolated
+  apply(x: Float64Array) {
+    const { older, previous } = this;
+    let applied = false;
+    if (this.history >= 2) {
+      let cross = 0;
+      let norm = 0;
+      for (let i = 0; i < x.length; i++) {
+        const step = previous[i] - older[i];
+        cross += (x[i] - previous[i]) * step;
+        norm += step * step;
+      }
+      const ratio = norm > 0 ? cross / norm : 0;
+      const size = Math.abs(ratio);
+      if (size > 0 && size < 1 && Math.abs(ratio - this.ratio) < 1e-2 * size * (1 - size)) {
+        const scale = ratio / (1 - ratio);
+        for (let i = 0; i < x.length; i++) x[i] += scale * (x[i] - previous[i]);
+        applied = true;
+      }
+      this.ratio = applied ? 0 : ratio;
+    }
+    this.history = applied ? 0 : this.history + 1;
+    older.set(previous);
+    previous.set(x);
+    return applied;
+  }
+}
+
+// Step bookkeeping for iterations that converge geometrically. A step that
+// moves x by `change` after one that moved it by `previous` suggests a
+// contraction ratio r = change / previous, leaving about change / (1 - r)
+// still to go; stopping on that, with r the larger of the last two ratios,
+// rather than on `change` alone keeps ratios near 1 from ending the
+// iteration early. A step far below the threshold stops regardless, since
+// ratios between rounding-level changes mean nothing. Growth across
+// DIVERGENCE_STEPS consecutive steps whose ratio has stopped falling, or a
+// non-finite step, marks the iteration as divergent; growth that is still
+// slowing can be the transient of a non-normal operator that converges, and
+// is left to run out its iterations. A step taken right after an
+// extrapolated jump has no meaningful ratio and starts the comparison afresh.
+const DIVERGENCE_STEPS = 10;
+
+class ConvergenceTracker {
+  iterations = 0;
+  converged = false;
+  diverged = false;
+  private previous = Infinity;
+  private ratios: number[] = [];
+  private jumped = false;
+  private detectDivergence: boolean;
+
+  // Normalized iterations cannot blow up, so they skip the growth check
+  constructor(detectDivergence = true) {
+    this.detectDivergence = detectDivergence;
+  }
+
+  // Records a step; returns true once the iteration should stop
+  step(change: number, threshold: number) {
+    this.iterations++;
+    if (!Number.isFinite(change)) {
+      this.diverged = true;
+      return true;
+    }
+    const ratio = this.jumped || this.previous === Infinity ? NaN : change / this.previous;
+    const { ratios } = this;
+    // The slower of the last two ratios; NaN until both are known
+    const slowest = Math.max(ratio, ratios[ratios.length - 1]);
+    ratios.push(ratio);
+    if (ratios.length > DIVERGENCE_STEPS) ratios.shift();
+    this.previous = change;
+    this.jumped = false;
+    if (this.detectDivergence && ratios.length === DIVERGENCE_STEPS &&
+        ratios.every(r => r >= 1) && ratio >= (1 - 1e-3) * ratios[0]) {
+      this.diverged = true;
+      return true;
+    }
+    this.converged = change === 0 || change < 1e-3 * threshold ||
+      (slowest < 1 && change / (1 - slowest) < threshold);
+    return this.converged;
+  }
+
+  // The next step is measured from an extrapolated point
+  jump() {
+    this.jumped = true;
+  }
+}
+
+function eigenvectorCentrality(graph: IndexedGraph, options: any): IterativeCentrality {
+  const maxIterations = options.maxIterations || CENTRALITY_OPTIONS.eigenvector.maxIterations;
+  const tolerance = options.tolerance || CENTRALITY_OPTIONS.eigenvector.tolerance;
+  const n = graph.nodeIds.length;
+  const eigenvector = new Float64Array(n).fill(1.0);
+  const progress = new ConvergenceTracker(false);
+  // Extrapolation only for undirected graphs; on directed ones the leading
+  // eigenvalue is often repeated and the error has no single dominant mode
+  const aitken = graph.directed ? null : new AitkenExtrapolation(n);
+
+  // Power iteration on A + I: same dominant eigenvector as A, but the shift
+  // keeps bipartite graphs from oscillating between two vectors. It also
+  // pulls the second eigenvalue towards the first, so steps shrink slowly
+  // and the stopping test estimates the distance still to go.
+  const run: PowerIteration = {
+    iterations: maxIterations,
+    input: () => eigenvector,
+    // Converged once the estimated remaining mean per-node change is below `tolerance`
+    advance(sums) {
+      for (let u = 0; u < n; u++) sums[u] += eigenvector[u];
+      normalizeMax(sums);
+      let change = 0;
+      for (let u = 0; u < n; u++) change += Math.abs(sums[u] - eigenvector[u]);
+      eigenvector.set(sums);
+      if (progress.step(change, n * tolerance)) return true;
+      if (aitken?.apply(eigenvector)) {
+        normalizeMax(eigenvector);
+        progress.jump();
+      }
+      return false;
+    }
+  };
+
+  return {
+    runs: [run],
+    assemble(index) {
+      const values = gather(eigenvector, index);
+      return {
+        columns: { value: values, normalizedValue: values },
+        statistics: {
+          maxEigenvalue: maxOf(eigenvector),
+          iterations: progress.iterations,
+          converged: progress.converged
+        }
+      };
+    }
+  };
+}
+
+function pageRankCentrality(graph: IndexedGraph, options: any): IterativeCentrality {
+  const damping = options.damping || CENTRALITY_OPTIONS.pagerank.damping;
+  const maxIterations = options.maxIterations || CENTRALITY_OPTIONS.pagerank.maxIterations;
+  const tolerance = options.tolerance || CENTRALITY_OPTIONS.pagerank.tolerance;
+  const n = graph.nodeIds.length;
+  const pagerank = new Float64Array(n).fill(1.0 / n);
+
+  // Rank is pushed as rank / outDegree, so the sweep is a plain row sum;
+  // the reciprocal degrees are taken once rather than on every step
+  const inverseDegree = new Float64Array(n);
+  for (let v = 0; v < n; v++) {
+    const outDegree = degree(graph, v);
+    inverseDegree[v] = outDegree > 0 ? 1 / outDegree : 0;
+  }
+
+  const share = new Float64Array(n);
+  const teleport = (1 - damping) / n;
+  // The damped iteration contracts by at most `damping` per step, so its
+  // slow modes settle into the steady ratio the extrapolation looks for
+  const aitken = new AitkenExtrapolation(n);
+  const run: PowerIteration = {
+    iterations: maxIterations,
+    input() {
+      for (let v = 0; v < n; v++) share[v] = pagerank[v] * inverseDegree[v];
+      return share;
+    },
+    // Converged once a step moves the rank vector by less than `tolerance`
+    // in L1
+    advance(sums) {
+      let change = 0;
+      for (let u = 0; u < n; u++) {
+        const rank = teleport + damping * sums[u];
+        change += Math.abs(rank - pagerank[u]);
+        pagerank[u] = rank;
+      }
+      // An extrapolated step is always followed by a plain one before the
+      // change is trusted
+      if (aitken.apply(pagerank)) return false;
+      return change < tolerance;
+    }
+  };
+
+  return {
+    runs: [run],
+    assemble(index) {
+      const values = gather(pagerank, index);
+      return {
+        columns: { value: values, normalizedValue: values },
+        statistics: {
+          totalRank: sumOf(values),
+          maxRank: maxOf(values)
+        }
+      };
+    }
+  };
+}
+
+function katzCentrality(graph: IndexedGraph, options: any): IterativeCentrality {
+  const alpha = options.alpha || CENTRALITY_OPTIONS.katz.alpha;
+  const beta = options.beta || CENTRALITY_OPTIONS.katz.beta;
+  const maxIterations = options.maxIterations || CENTRALITY_OPTIONS.katz.maxIterations;
+  const tolerance = options.tolerance || CENTRALITY_OPTIONS.katz.tolerance;
+  const n = graph.nodeIds.length;
+  const katz = new Float64Array(n).fill(beta);
+  const aitken = new AitkenExtrapolation(n);
+  const progress = new ConvergenceTracker();
+
+  // Each step adds the next term of the Neumann series
+  // beta * (I + alpha A + alpha^2 A^2 + ...) 1 = beta * (I - alpha A)^-1 1,
+  // which converges when alpha is below 1 / the largest eigenvalue. A series
+  // that diverges, or runs out of iterations, is reported as not converged.
+  const run: PowerIteration = {
+    iterations: maxIterations,
+    input: () => katz,
+    advance(sums) {
+      let change = 0;
+      for (let u = 0; u < n; u++) {
+        const value = beta + alpha * sums[u];
+        change += Math.abs(value - katz[u]);
+        katz[u] = value;
+      }
+      if (progress.step(change, n * tolerance)) return true;
+      if (aitken.apply(katz)) progress.jump();
+      return false;
+    }
+  };
+
+  return {
+    runs: [run],
+    assemble(index) {
+      const normalized = new Float64Array(katz.length);
+      const maxValue = normalizeMax(katz, normalized);
+      return {
+        columns: { value: gather(katz, index), normalizedValue: gather(normalized, index) },
+        statistics: {
+          alpha,
+          beta,
+          maxKatz: maxValue,
+          iterations: progress.iterations,
+          converged: progress.converged
+        }
+      };
+    }
+  };
+}
+
+function hitsCentrality(graph: IndexedGraph, options: any): IterativeCentrality {
+  const maxIterations = options.maxIterations || CENTRALITY_OPTIONS.hits.maxIterations;
+  const n = graph.nodeIds.length;
+  const hubs = new Float64Array(n).fill(1.0);
+  const authorities = new Float64Array(n).fill(1.0);
+
+  // Simplified iterative computation: authorities sum neighbouring hubs and
+  // hubs sum neighbouring authorities, both from the previous step
+  const runs: PowerIteration[] = [
+    { iterations: maxIterations, input: () => hubs, advance: sums => authorities.set(sums) },
+    { iterations: maxIterations, input: () => authorities, advance: sums => hubs.set(sums) }
+  ];
+
+  return {
+    runs,
+    assemble(index) {
+      const authorityValues = gather(authorities, index);
+      return {
+        columns: {
+          value: authorityValues,
+          normalizedValue: authorityValues,
+          hubValue: gather(hubs, index),
+          authorityValue: authorityValues
+        },
+        statistics: {
+          maxHub: maxOf(hubs),
+          maxAuthority: maxOf(authorities)
+        }
+      };
+    }
+  };
+}
+
+
+// The engine is shared by every route in the process, so its kernels are
+// exercised once on a toy graph when the module loads: both the single-run
+// and fused iteration paths, directed and undirected. The toy graph bypasses
+// the shared graph cache.
+function warmUpEngine() {
+  const ids = ['a', 'b', 'c', 'd'];
+  const edges = { source: ['a', 'b', 'c', 'c'], target: ['b', 'c', 'a', 'd'], weight: null };
+  const algorithms = Array.from(CENTRALITY_ALGORITHMS);
+  for (const directed of [false, true]) {
+    const graph = buildGraph(ids, edges, directed);
+    const network = { graph, ids, index: nodeIndex(ids, graph), key: '' };
+    computeCentralities(network, algorithms, {});
+    for (const algorithm of algorithms) computeCentralities(network, [algorithm], {});
+  }
+}
+
+warmUpEngine();
@@ -0,0 +1,211 @@
+// Louvain community detection over the CSR graph from `./graph`.
+//
+// Each level runs the local-moving phase using the modularity *gain* of a
+// move, k_i,in - resolution * tot_c * k_i / 2m, instead of re-evaluating the
+// full modularity, then contracts communities into a smaller CSR graph.
+
+import { type IndexedGraph, toUndirected } from './graph';
+
+interface LevelGraph {
+  n: number;
+  indptr: Int32Array;
+  indices: Int32Array;
+  weights: Float64Array;
+  selfLoops: Float64Array;
+}
+
+export interface LouvainOptions {
+  resolution?: number;
+  maxLevels?: number;
+  maxPasses?: number;
+}
+
+export interface LouvainResult {
+  membership: Int32Array;
+  communityCount: number;
+  modularity: number;
+  levels: number;
+}
+
+export function louvain(graph: IndexedGraph, options: LouvainOptions = {}): LouvainResult {
+  const resolution = options.resolution ?? 1;
+  const maxLevels = options.maxLevels ?? 20;
+  const maxPasses = options.maxPasses ?? 50;
+
+  const g = toUndirected(graph);
+  const n = g.nodeIds.length;
+  let level: LevelGraph = {
+    n,
+    indptr: g.indptr,
+    indices: g.indices,
+    weights: g.weights ?? new Float64Array(g.indices.length).fill(1),
+    selfLoops: new Float64Array(n)
+  };
+
+  const membership = new Int32Array(n);
+  for (let i = 0; i < n; i++) membership[i] = i;
+
+  let levels = 0;
+  while (levels < maxLevels) {
+    const { community, count, moved } = moveNodes(level, resolution, maxPasses);
+    if (!moved) break;
+    for (let i = 0; i < n; i++) membership[i] = community[membership[i]];
+    level = contract(level, community, count);
+    levels++;
+  }
+
+  return {
+    membership,
+    communityCount: level.n,
+    modularity: modularity(g, membership, resolution),
+    levels
+  };
+}
+
+function moveNodes(level: LevelGraph, resolution: number, maxPasses: number) {
+  const { n, indptr, indices, weights, selfLoops } = level;
+  const k = new Float64Array(n);
+  const tot = new Float64Array(n);
+  const community = new Int32Array(n);
+  let twoM = 0;
+  for (let i = 0; i < n; i++) {
+    let sum = 2 * selfLoops[i];
+    for (let e = indptr[i]; e < indptr[i + 1]; e++) sum += weights[e];
+    k[i] = sum;
+    tot[i] = sum;
+    community[i] = i;
+    twoM += sum;
+  }
+
+  let moved = false;
+  if (twoM === 0) return { community, count: n, moved };
+
+  // Scratch space for the per-node neighbour-community weights
+  const linkWeight = new Float64Array(n);
+  const touched = new Int32Array(n);
+
+  for (let pass = 0; pass < maxPasses; pass++) {
+    let movesThisPass = 0;
+    for (let i = 0; i < n; i++) {
+      const current = community[i];
+      let touchedCount = 0;
+      for (let e = indptr[i]; e < indptr[i + 1]; e++) {
+        const c = community[indices[e]];
+        if (linkWeight[c] === 0) touched[touchedCount++] = c;
+        linkWeight[c] += weights[e];
+      }
+
+      tot[current] -= k[i];
+      const scale = resolution * k[i] / twoM;
+      let best = current;
+      let bestGain = linkWeight[current] - scale * tot[current];
+      for (let t = 0; t < touchedCount; t++) {
+        const c = touched[t];
+        const gain = linkWeight[c] - scale * tot[c];
+        if (gain > bestGain) {
+          bestGain = gain;
+          best = c;
+        }
+      }
+      tot[best] += k[i];
+
+      for (let t = 0; t < touchedCount; t++) linkWeight[touched[t]] = 0;
+      if (best !== current) {
+        community[i] = best;
+        movesThisPass++;
+      }
+    }
+    if (movesThisPass === 0) break;
+    moved = true;
+  }
+
+  // Renumber communities densely
+  const relabel = new Int32Array(n).fill(-1);
+  let count = 0;
+  for (let i = 0; i < n; i++) {
+    const c = community[i];
+    if (relabel[c] < 0) relabel[c] = count++;
+    community[i] = relabel[c];
+  }
+  return { community, count, moved };
+}
+
+function contract(level: LevelGraph, community: Int32Array, count: number): LevelGraph {
+  const { n, indptr, indices, weights, selfLoops } = level;
+
+  // Group member nodes by community (counting sort)
+  const memberPtr = new Int32Array(count + 1);
+  for (let i = 0; i < n; i++) memberPtr[community[i] + 1]++;
+  for (let c = 0; c < count; c++) memberPtr[c + 1] += memberPtr[c];
+  const members = new Int32Array(n);
+  const fill = memberPtr.slice(0, count);
+  for (let i = 0; i < n; i++) members[fill[community[i]]++] = i;
+
+  const newSelfLoops = new Float64Array(count);
+  const newIndptr = new Int32Array(count + 1);
+  const newIndices: number[] = [];
+  const newWeights: number[] = [];
+  const linkWeight = new Float64Array(count);
+  const touched = new Int32Array(count);
+
+  for (let c = 0; c < count; c++) {
+    let touchedCount = 0;
+    let internal = 0;
+    for (let m = memberPtr[c]; m < memberPtr[c + 1]; m++) {
+      const u = members[m];
+      newSelfLoops[c] += selfLoops[u];
+      for (let e = indptr[u]; e < indptr[u + 1]; e++) {
+        const target = community[indices[e]];
+        if (target === c) {
+          internal += weights[e];
+        } else {
+          if (linkWeight[target] === 0) touched[touchedCount++] = target;
+          linkWeight[target] += weights[e];
+        }
+      }
+    }
+    // Internal arcs were seen from both endpoints
+    newSelfLoops[c] += internal / 2;
+
+    touched.subarray(0, touchedCount).sort();
+    for (let t = 0; t < touchedCount; t++) {
+      newIndices.push(touched[t]);
+      newWeights.push(linkWeight[touched[t]]);
+      linkWeight[touched[t]] = 0;
+    }
+    newIndptr[c + 1] = newIndices.length;
+  }
+
+  return {
+    n: count,
+    indptr: newIndptr,
+    indices: Int32Array.from(newIndices),
+    weights: Float64Array.from(newWeights),
+    selfLoops: newSelfLoops
+  };
+}
+
+// Newman-Girvan modularity of a partition of an undirected graph.
+export function modularity(graph: IndexedGraph, membership: Int32Array, resolution = 1) {
+  const g = toUndirected(graph);
+  const n = g.nodeIds.length;
+  const internal = new Float64Array(n);
+  const tot = new Float64Array(n);
+  let twoM = 0;
+  for (let u = 0; u < n; u++) {
+    for (let e = g.indptr[u]; e < g.indptr[u + 1]; e++) {
+      const w = g.weights ? g.weights[e] : 1;
+      tot[membership[u]] += w;
+      if (membership[g.indices[e]] === membership[u]) internal[membership[u]] += w;
+      twoM += w;
+    }
+  }
+  if (twoM === 0) return 0;
+
+  let q = 0;
+  for (let c = 0; c < n; c++) {
+    if (tot[c] === 0) continue;
+    q += internal[c] / twoM - resolution * (tot[c] / twoM) ** 2;
+  }
+  return q;
+}
@@ -0,0 +1,734 @@
+// Integer-indexed CSR graph shared by the network analysis routes.
+//
+// Node ids are mapped to contiguous indices once, and adjacency is stored as
+// `indptr`/`indices` typed arrays so the metric kernels below run over flat
+// memory instead of string-keyed objects. The id -> index map is only needed
+// while resolving edge endpoints and is not kept on the graph.
+
+import { ContentHasher, LRUCache } from './cache';
+
+export interface IndexedGraph {
+  nodeIds: string[];
+  directed: boolean;
+  edgeCount: number;
+  indptr: Int32Array;
+  indices: Int32Array;
+  weights: Float64Array | null;
+}
+
+// Edge list in struct-of-arrays form: parallel source/target(/weight) columns.
+export interface EdgeColumns {
+  source: ArrayLike<any>;
+  target: ArrayLike<any>;
+  weight: ArrayLike<number> | null;
+}
+
+// Node ids from either a list of node objects or an `{ ids: [...] }` column.
+export function nodeColumn(nodes: any): any[] | null {
+  if (Array.isArray(nodes)) return nodes.map((node: any) => node.id);
+  if (nodes && Array.isArray(nodes.ids)) return nodes.ids;
+  return null;
+}
+
+// Edge columns from either a list of edge objects or
+// `{ source: [...], target: [...], weight?: [...] }`.
+export function edgeColumns(edges: any): EdgeColumns | null {
+  if (Array.isArray(edges)) {
+    const weighted = edges.some((edge: any) => typeof edge.weight === 'number');
+    return {
+      source: edges.map((edge: any) => edge.source),
+      target: edges.map((edge: any) => edge.target),
+      weight: weighted
+        ? Float64Array.from(edges, (edge: any) => typeof edge.weight === 'number' ? edge.weight : 1)
+        : null
+    };
+  }
+  if (edges && Array.isArray(edges.source) && Array.isArray(edges.target) &&
+      edges.source.length === edges.target.length) {
+    return {
+      source: edges.source,
+      target: edges.target,
+      weight: Array.isArray(edges.weight) ? edges.weight : null
+    };
+  }
+  return null;
+}
+
+export function buildGraph(ids: ArrayLike<any>, edges: EdgeColumns, directed = false): IndexedGraph {
+  const nodeIds: string[] = [];
+  const indexOf = new Map<string, number>();
+  for (let i = 0; i < ids.length; i++) {
+    const key = String(ids[i]);
+    if (!indexOf.has(key)) {
+      indexOf.set(key, nodeIds.length);
+      nodeIds.push(ids[i]);
+    }
+  }
+
+  const { source, target, weight } = edges;
+  const src = new Int32Array(source.length);
+  const dst = new Int32Array(source.length);
+  for (let e = 0; e < source.length; e++) {
+    src[e] = indexOf.get(String(source[e])) ?? -1;
+    dst[e] = indexOf.get(String(target[e])) ?? -1;
+  }
+
+  return assemble(nodeIds, src, dst, weight, directed);
+}
+
+// Graph over nodes `0..nodeCount-1` from already-resolved index columns, so
+// binary payloads skip id hashing entirely. Out-of-range endpoints are dropped.
+export function buildIndexedGraph(
+  nodeCount: number,
+  source: Int32Array,
+  target: Int32Array,
+  weight: ArrayLike<number> | null,
+  directed = false
+): IndexedGraph {
+  const nodeIds = Array.from({ length: nodeCount }, (_, i) => String(i));
+  const src = new Int32Array(source.length);
+  const dst = new Int32Array(source.length);
+  for (let e = 0; e < source.length; e++) {
+    src[e] = source[e] >= 0 && source[e] < nodeCount ? source[e] : -1;
+    dst[e] = target[e] >= 0 && target[e] < nodeCount ? target[e] : -1;
+  }
+  return assemble(nodeIds, src, dst, weight, directed);
+}
+
+// Approximate retained size of a graph: the CSR arrays plus node id strings.
+export function graphBytes(graph: IndexedGraph) {
+  return graph.indptr.byteLength + graph.indices.byteLength +
+    (graph.weights ? graph.weights.byteLength : 0) + graph.nodeIds.length * 48;
+}
+
+// Built graphs keyed by payload content, so repeated requests for the same
+// network (across analyses and routes) skip id resolution and CSR assembly.
+// Bounded by retained bytes as well as entries so a few very large graphs
+// can't pin the process heap.
+const graphCache = new LRUCache<string, IndexedGraph>(32, {
+  maxCost: 256 * 1024 * 1024,
+  cost: graphBytes
+});
+
+function hashWeights(hasher: ContentHasher, weight: ArrayLike<number> | null) {
+  if (!weight) return hasher.update(null);
+  return ArrayBuffer.isView(weight) ? hasher.updateBytes(weight) : hasher.updateColumn(weight);
+}
+
+// Stable content key for a network payload: identical across requests and
+// server processes for the same ids, edges, weights and direction.
+export function networkKey(ids: ArrayLike<any>, edges: EdgeColumns, directed = false) {
+  const hasher = new ContentHasher().update(directed ? 'ids:directed' : 'ids');
+  hasher.updateColumn(ids).updateColumn(edges.source).updateColumn(edges.target);
+  return hashWeights(hasher, edges.weight).digest();
+}
+
+export function getGraph(ids: ArrayLike<any>, edges: EdgeColumns, directed = false): IndexedGraph {
+  const key = networkKey(ids, edges, directed);
+
+  let graph = graphCache.get(key);
+  if (!graph) {
+    graph = buildGraph(ids, edges, directed);
+    graphCache.set(key, graph);
+  }
+  return graph;
+}
+
+export function getIndexedGraph(
+  nodeCount: number,
+  source: Int32Array,
+  target: Int32Array,
+  weight: ArrayLike<number> | null,
+  directed = false
+): IndexedGraph {
+  const hasher = new ContentHasher().update(directed ? 'indexed:directed' : 'indexed');
+  hasher.update(nodeCount).updateBytes(source).updateBytes(target);
+  const key = hashWeights(hasher, weight).digest();
+
+  let graph = graphCache.get(key);
+  if (!graph) {
+    graph = buildIndexedGraph(nodeCount, source, target, weight, directed);
+    graphCache.set(key, graph);
+  }
+  return graph;
+}
+
+const fingerprints = new WeakMap<IndexedGraph, string>();
+
+// Content hash of the assembled graph rather than of the payload it came
+// from. CSR rows are sorted and de-duplicated, so payloads that differ only
+// in edge order or repeated edges share a fingerprint.
+export function graphFingerprint(graph: IndexedGraph) {
+  let fingerprint = fingerprints.get(graph);
+  if (fingerprint === undefined) {
+    const hasher = new ContentHasher().update(graph.directed ? 'csr:directed' : 'csr');
+    hasher.updateColumn(graph.nodeIds).updateBytes(graph.indptr).updateBytes(graph.indices);
+    fingerprint = hashWeights(hasher, graph.weights).digest();
+    fingerprints.set(graph, fingerprint);
+  }
+  return fingerprint;
+}
+
+export const BINARY_NETWORK_CONTENT_TYPE = 'application/octet-stream';
+
+export interface BinaryNetwork {
+  nodeCount: number;
+  source: Int32Array;
+  target: Int32Array;
+  weight: Float32Array | null;
+}
+
+// Binary edge list, little-endian:
+//   int32 nodeCount, int32 edgeCount,
+//   int32 source[edgeCount], int32 target[edgeCount],
+//   float32 weight[edgeCount] (optional)
+// Columns are zero-copy views over the request buffer.
+export function decodeBinaryNetwork(buffer: ArrayBuffer): BinaryNetwork | null {
+  if (buffer.byteLength < 8) return null;
+  const view = new DataView(buffer);
+  const nodeCount = view.getInt32(0, true);
+  const edgeCount = view.getInt32(4, true);
+  if (nodeCount < 0 || edgeCount < 0) return null;
+
+  const columnBytes = edgeCount * 4;
+  const unweightedBytes = 8 + 2 * columnBytes;
+  const weighted = buffer.byteLength === unweightedBytes + columnBytes;
+  if (!weighted && buffer.byteLength !== unweightedBytes) return null;
+
+  return {
+    nodeCount,
+    source: new Int32Array(buffer, 8, edgeCount),
+    target: new Int32Array(buffer, 8 + columnBytes, edgeCount),
+    weight: weighted ? new Float32Array(buffer, unweightedBytes, edgeCount) : null
+  };
+}
+
+export interface NetworkRequest {
+  body: any;
+  // Set only for binary bodies; null when the payload does not decode
+  binary?: BinaryNetwork | null;
+  error?: string;
+}
+
+// JSON bodies carry the network inline. Binary edge-list bodies carry only
+// the edge columns; the other parameters come from the query string, with
+// `directed` as a flag and `options` as JSON. The decoded network is kept
+// apart from `body`, so no JSON body can put a request on the binary path.
+export async function readNetworkRequest(request: Request): Promise<NetworkRequest> {
+  const contentType = request.headers.get('content-type') || '';
+  if (!contentType.startsWith(BINARY_NETWORK_CONTENT_TYPE)) {
+    return { body: await request.json() };
+  }
+
+  const { searchParams } = new URL(request.url);
+  const body: any = Object.fromEntries(searchParams);
+  body.directed = body.directed === 'true';
+  let options: any = null;
+  try {
+    options = JSON.parse(body.options || '{}');
+  } catch (error) {
+    // Reported below along with non-object options
+  }
+  if (!options || typeof options !== 'object' || Array.isArray(options)) {
+    return { body, error: 'Malformed options' };
+  }
+  body.options = options;
+  return { body, binary: decodeBinaryNetwork(await request.arrayBuffer()) };
+}
+
+// CSR assembly from resolved endpoint indices; edges with an unknown
+// endpoint (-1) and self-loops are dropped. Built with counting passes
+// straight into typed arrays: no per-edge tuples and no comparison sorts.
+function assemble(
+  nodeIds: string[],
+  src: Int32Array,
+  dst: Int32Array,
+  weight: ArrayLike<number> | null,
+  directed: boolean
+): IndexedGraph {
+  const n = nodeIds.length;
+  let arcCount = 0;
+  for (let e = 0; e < src.length; e++) {
+    if (src[e] >= 0 && dst[e] >= 0 && src[e] !== dst[e]) arcCount += directed ? 1 : 2;
+  }
+
+  const arcSrc = new Int32Array(arcCount);
+  const arcDst = new Int32Array(arcCount);
+  const arcWeight = weight ? new Float64Array(arcCount) : null;
+  for (let e = 0, a = 0; e < src.length; e++) {
+    const u = src[e];
+    const v = dst[e];
+    if (u < 0 || v < 0 || u === v) continue;
+    const w = weight ? (weight[e] ?? 1) : 1;
+    arcSrc[a] = u;
+    arcDst[a] = v;
+    if (arcWeight) arcWeight[a] = w;
+    a++;
+    if (!directed) {
+      arcSrc[a] = v;
+      arcDst[a] = u;
+      if (arcWeight) arcWeight[a] = w;
+      a++;
+    }
+  }
+
+  // Stable counting sort by target, then by source, leaves every row
+  // ordered by column
+  const order = countingOrder(arcSrc, n, countingOrder(arcDst, n, null));
+
+  // Rows are de-duplicated in place, keeping the lightest parallel edge
+  const indptr = new Int32Array(n + 1);
+  const indices = new Int32Array(arcCount);
+  const weights = arcWeight ? new Float64Array(arcCount) : null;
+  let size = 0;
+  for (let u = 0, k = 0; u < n; u++) {
+    const rowStart = size;
+    for (; k < arcCount && arcSrc[order[k]] === u; k++) {
+      const arc = order[k];
+      const v = arcDst[arc];
+      if (size > rowStart && indices[size - 1] === v) {
+        if (weights && arcWeight![arc] < weights[size - 1]) weights[size - 1] = arcWeight![arc];
+        continue;
+      }
+      indices[size] = v;
+      if (weights) weights[size] = arcWeight![arc];
+      size++;
+    }
+    indptr[u + 1] = size;
+  }
+
+  return {
+    nodeIds,
+    directed,
+    edgeCount: directed ? size : size / 2,
+    indptr,
+    indices: size < arcCount ? indices.slice(0, size) : indices,
+    weights: weights && size < arcCount ? weights.slice(0, size) : weights
+  };
+}
+
+// Stable permutation of `0..keys.length-1` ordered by key (keys in `0..n-1`),
+// visiting items in `order` when given.
+function countingOrder(keys: Int32Array, n: number, order: Int32Array | null) {
+  const next = new Int32Array(n + 1);
+  for (let k = 0; k < keys.length; k++) next[keys[k] + 1]++;
+  for (let i = 0; i < n; i++) next[i + 1] += next[i];
+  const sorted = new Int32Array(keys.length);
+  for (let k = 0; k < keys.length; k++) {
+    const item = order ? order[k] : k;
+    sorted[next[keys[item]]++] = item;
+  }
+  return sorted;
+}
+
+export function degree(graph: IndexedGraph, i: number) {
+  return graph.indptr[i + 1] - graph.indptr[i];
+}
+
+const undirectedViews = new WeakMap<IndexedGraph, IndexedGraph>();
+
+// Symmetrized view used by metrics that are only defined on undirected
+// graphs; built once per directed graph and reused by every metric.
+export function toUndirected(graph: IndexedGraph): IndexedGraph {
+  if (!graph.directed) return graph;
+  let view = undirectedViews.get(graph);
+  if (!view) {
+    view = symmetrize(graph);
+    undirectedViews.set(graph, view);
+  }
+  return view;
+}
+
+function symmetrize(graph: IndexedGraph): IndexedGraph {
+  const arcs = graph.indices.length;
+  const source = new Int32Array(arcs);
+  for (let u = 0; u < graph.nodeIds.length; u++) {
+    source.fill(u, graph.indptr[u], graph.indptr[u + 1]);
+  }
+  return assemble(graph.nodeIds, source, graph.indices, graph.weights, false);
+}
+
+// Unweighted single-source distances; `dist` and `queue` are caller-owned
+// buffers so all-pairs sweeps allocate once. Unreached nodes stay Infinity.
+export function bfs(graph: IndexedGraph, source: number, dist: Float64Array, queue: Int32Array) {
+  dist.fill(Infinity);
+  dist[source] = 0;
+  queue[0] = source;
+  let head = 0;
+  let tail = 1;
+  while (head < tail) {
+    const u = queue[head++];
+    const du = dist[u] + 1;
+    for (let k = graph.indptr[u]; k < graph.indptr[u + 1]; k++) {
+      const v = graph.indices[k];
+      if (dist[v] === Infinity) {
+        dist[v] = du;
+        queue[tail++] = v;
+      }
+    }
+  }
+  return tail;
+}
+
+// Binary min-heap of node indices keyed by an external distance array, with
+// a position table so decrease-key is O(log n) and nothing is re-queued.
+export class DistanceHeap {
+  size = 0;
+  private dist: Float64Array;
+  private heap: Int32Array;
+  private position: Int32Array;
+
+  constructor(dist: Float64Array) {
+    this.dist = dist;
+    this.heap = new Int32Array(dist.length);
+    this.position = new Int32Array(dist.length).fill(-1);
+  }
+
+  clear() {
+    for (let i = 0; i < this.size; i++) this.position[this.heap[i]] = -1;
+    this.size = 0;
+  }
+
+  // Insert `v`, or restore heap order after `dist[v]` decreased.
+  push(v: number) {
+    let i = this.position[v];
+    if (i < 0) {
+      i = this.size++;
+      this.heap[i] = v;
+      this.position[v] = i;
+    }
+    this.siftUp(i);
+  }
+
+  pop() {
+    const top = this.heap[0];
+    this.position[top] = -1;
+    this.size--;
+    if (this.size > 0) {
+      this.heap[0] = this.heap[this.size];
+      this.position[this.heap[0]] = 0;
+      this.siftDown(0);
+    }
+    return top;
+  }
+
+  private siftUp(i: number) {
+    const { heap, position, dist } = this;
+    const v = heap[i];
+    while (i > 0) {
+      const parent = (i - 1) >> 1;
+      if (dist[heap[parent]] <= dist[v]) break;
+      heap[i] = heap[parent];
+      position[heap[i]] = i;
+      i = parent;
+    }
+    heap[i] = v;
+    position[v] = i;
+  }
+
+  private siftDown(i: number) {
+    const { heap, position, dist } = this;
+    const v = heap[i];
+    for (;;) {
+      let child = 2 * i + 1;
+      if (child >= this.size) break;
+      if (child + 1 < this.size && dist[heap[child + 1]] < dist[heap[child]]) child++;
+      if (dist[heap[child]] >= dist[v]) break;
+      heap[i] = heap[child];
+      position[heap[i]] = i;
+      i = child;
+    }
+    heap[i] = v;
+    position[v] = i;
+  }
+}
+
+// Weighted single-source distances (non-negative weights). `heap` must have
+// been constructed over the same `dist` buffer.
+export function dijkstra(graph: IndexedGraph, source: number, dist: Float64Array, heap: DistanceHeap) {
+  const weights = graph.weights;
+  dist.fill(Infinity);
+  dist[source] = 0;
+  heap.clear();
+  heap.push(source);
+
+  let reached = 0;
+  while (heap.size > 0) {
+    const u = heap.pop();
+    reached++;
+    for (let k = graph.indptr[u]; k < graph.indptr[u + 1]; k++) {
+      const v = graph.indices[k];
+      const candidate = dist[u] + (weights ? weights[k] : 1);
+      if (candidate < dist[v]) {
+        dist[v] = candidate;
+        heap.push(v);
+      }
+    }
+  }
+  return reached;
+}
+
+export interface Components {
+  count: number;
+  componentOf: Int32Array;
+  sizes: Int32Array;
+  largest: number;
+}
+
+// Components are invariant for a graph, so the path sweep and the analyses
+// that report them share one pass per graph
+const componentSets = new WeakMap<IndexedGraph, Components>();
+
+// Weakly connected components by union-find over the arcs, O(V + E).
+export function connectedComponents(graph: IndexedGraph): Components {
+  let components = componentSets.get(graph);
+  if (!components) {
+    components = findComponents(graph);
+    componentSets.set(graph, components);
+  }
+  return components;
+}
+
+function findComponents(graph: IndexedGraph): Components {
+  const n = graph.nodeIds.length;
+  const parent = new Int32Array(n);
+  for (let i = 0; i < n; i++) parent[i] = i;
+  const find = (x: number) => {
+    while (parent[x] !== x) {
+      parent[x] = parent[parent[x]];
+      x = parent[x];
+    }
+    return x;
+  };
+  for (let u = 0; u < n; u++) {
+    for (let k = graph.indptr[u]; k < graph.indptr[u + 1]; k++) {
+      const a = find(u);
+      const b = find(graph.indices[k]);
+      if (a !== b) parent[a < b ? b : a] = a < b ? a : b;
+    }
+  }
+
+  const label = new Int32Array(n).fill(-1);
+  const componentOf = new Int32Array(n);
+  const counts: number[] = [];
+  for (let i = 0; i < n; i++) {
+    const root = find(i);
+    if (label[root] < 0) {
+      label[root] = counts.length;
+      counts.push(0);
+    }
+    componentOf[i] = label[root];
+    counts[label[root]]++;
+  }
+
+  let largest = 0;
+  for (const size of counts) if (size > largest) largest = size;
+  return { count: counts.length, componentOf, sizes: Int32Array.from(counts), largest };
+}
+
+export interface PathSummary {
+  // Number of BFS/Dijkstra sources swept; less than the node count when sampled
+  sources: number;
+  eccentricity: Float64Array;
+  distanceSum: Float64Array;
+  reached: Int32Array;
+  averagePathLength: number;
+  diameter: number;
+  radius: number;
+  reachablePairs: number;
+}
+
+// All-pairs distance statistics are invariant for a graph, and graphs are
+// shared through the content-keyed cache, so each graph pays for one
+// sweep per distance kind and source budget no matter how many requests ask.
+const pathSummaries = new WeakMap<IndexedGraph, Map<string, PathSummary>>();
+
+// Diameter, radius, average path length and per-node eccentricity from a
+// single BFS (or Dijkstra, when `weighted`) sweep over every source, after
+// one components pass.
+//
+// Graphs with more than `maxSources` nodes are swept from that many evenly
+// spaced sources instead: the average path length becomes an estimate,
+// diameter a lower bound and radius an upper bound, and per-node entries
+// are filled only for the swept sources.
+export function shortestPathSummary(graph: IndexedGraph, weighted = false, maxSources = Infinity): PathSummary {
+  const useWeights = weighted && graph.weights !== null;
+  const n = graph.nodeIds.length;
+  const sources = Math.min(n, maxSources);
+  const kind = useWeights ? 'weighted' : 'hops';
+  let memo = pathSummaries.get(graph);
+  if (!memo) {
+    memo = new Map();
+    pathSummaries.set(graph, memo);
+  }
+  const cached = memo.get(`${kind}:${n}`) ?? memo.get(`${kind}:${sources}`);
+  if (cached) return cached;
+
+  const dist = new Float64Array(n);
+  const queue = new Int32Array(n);
+  const heap = useWeights ? new DistanceHeap(dist) : null;
+  const eccentricity = new Float64Array(n);
+  const distanceSum = new Float64Array(n);
+  const reached = new Int32Array(n);
+  const stride = sources > 0 ? n / sources : 1;
+
+  let totalDistance = 0;
+  let reachablePairs = 0;
+  let diameter = 0;
+  let radius = Infinity;
+  // Nodes in singleton components reach nothing, so their searches are
+  // skipped; BFS statistics are read from the visit queue, which only holds
+  // the source's component, instead of scanning every node.
+  const components = connectedComponents(graph);
+  for (let j = 0; j < sources; j++) {
+    const s = Math.floor(j * stride);
+    if (components.sizes[components.componentOf[s]] === 1) continue;
+
+    let sum = 0;
+    let count = 0;
+    let ecc = 0;
+    if (heap) {
+      dijkstra(graph, s, dist, heap);
+      for (let t = 0; t < n; t++) {
+        const d = dist[t];
+        if (t === s || d === Infinity) continue;
+        sum += d;
+        count++;
+        if (d > ecc) ecc = d;
+      }
+    } else {
+      const visited = bfs(graph, s, dist, queue);
+      for (let k = 1; k < visited; k++) sum += dist[queue[k]];
+      count = visited - 1;
+      // BFS visits in distance order, so the last node is the farthest
+      ecc = count > 0 ? dist[queue[visited - 1]] : 0;
+    }
+
+    eccentricity[s] = ecc;
+    distanceSum[s] = sum;
+    reached[s] = count;
+    totalDistance += sum;
+    reachablePairs += count;
+    if (ecc > diameter) diameter = ecc;
+    if (count > 0 && ecc < radius) radius = ecc;
+  }
+
+  const summary: PathSummary = {
+    sources,
+    eccentricity,
+    distanceSum,
+    reached,
+    averagePathLength: reachablePairs > 0 ? totalDistance / reachablePairs : 0,
+    diameter,
+    radius: radius === Infinity ? 0 : radius,
+    reachablePairs
+  };
+  memo.set(`${kind}:${sources}`, summary);
+  return summary;
+}
+
+export interface TriangleCounts {
+  perNode: Int32Array;
+  total: number;
+}
+
+// Triangles on the undirected view via degree ordering: each edge is
+// oriented from lower to higher (degree, index) rank, so every triangle is
+// found exactly once and the out-lists of hub nodes stay short.
+export function triangleCounts(graph: IndexedGraph): TriangleCounts {
+  const g = toUndirected(graph);
+  const n = g.nodeIds.length;
+  const ranksAbove = (u: number, v: number) => {
+    const du = degree(g, u);
+    const dv = degree(g, v);
+    return dv > du || (dv === du && v > u);
+  };
+
+  const outPtr = new Int32Array(n + 1);
+  for (let u = 0; u < n; u++) {
+    let count = 0;
+    for (let k = g.indptr[u]; k < g.indptr[u + 1]; k++) {
+      if (ranksAbove(u, g.indices[k])) count++;
+    }
+    outPtr[u + 1] = outPtr[u] + count;
+  }
+  const out = new Int32Array(outPtr[n]);
+  for (let u = 0, p = 0; u < n; u++) {
+    for (let k = g.indptr[u]; k < g.indptr[u + 1]; k++) {
+      if (ranksAbove(u, g.indices[k])) out[p++] = g.indices[k];
+    }
+  }
+
+  const perNode = new Int32Array(n);
+  const mark = new Int32Array(n).fill(-1);
+  let total = 0;
+  for (let u = 0; u < n; u++) {
+    for (let k = outPtr[u]; k < outPtr[u + 1]; k++) mark[out[k]] = u;
+    for (let k = outPtr[u]; k < outPtr[u + 1]; k++) {
+      const v = out[k];
+      for (let j = outPtr[v]; j < outPtr[v + 1]; j++) {
+        const w = out[j];
+        if (mark[w] === u) {
+          perNode[u]++;
+          perNode[v]++;
+          perNode[w]++;
+          total++;
+        }
+      }
+    }
+  }
+
+  return { perNode, total };
+}
+
+// Connected triples and degree-mixing sums from one sweep over the
+// undirected view. Per-arc sums of d(u) and d(u)^2 collapse to per-node
+// d^2 and d^3, so only the degree product needs the arc loop.
+function degreeMixing(g: IndexedGraph) {
+  let triples = 0;
+  let sumProduct = 0;
+  let sumDegree = 0;
+  let sumSquare = 0;
+  for (let u = 0; u < g.nodeIds.length; u++) {
+    const du = degree(g, u);
+    triples += du * (du - 1) / 2;
+    sumDegree += du * du;
+    sumSquare += du * du * du;
+    for (let k = g.indptr[u]; k < g.indptr[u + 1]; k++) {
+      sumProduct += du * degree(g, g.indices[k]);
+    }
+  }
+
+  // Newman's degree assortativity over the arcs (both directions per edge)
+  const arcs = g.indices.length;
+  let assortativity = 0;
+  if (arcs > 0) {
+    const mean = sumDegree / arcs;
+    const variance = sumSquare / arcs - mean * mean;
+    if (variance > 0) assortativity = (sumProduct / arcs - mean * mean) / variance;
+  }
+  return { triples, assortativity };
+}
+
+export function transitivity(graph: IndexedGraph, triangles = triangleCounts(graph)) {
+  const { triples } = degreeMixing(toUndirected(graph));
+  return triples > 0 ? 3 * triangles.total / triples : 0;
+}
+
+// Newman's degree assortativity coefficient over the undirected edge set.
+export function degreeAssortativity(graph: IndexedGraph) {
+  return degreeMixing(toUndirected(graph)).assortativity;
+}
+
+// Triangles, transitivity and assortativity together: the undirected view,
+// the triangle count and the degree sweep are each computed once.
+export function structuralSummary(graph: IndexedGraph) {
+  const g = toUndirected(graph);
+  const triangles = triangleCounts(g);
+  const { triples, assortativity } = degreeMixing(g);
+  return {
+    triangles,
+    transitivity: triples > 0 ? 3 * triangles.total / triples : 0,
+    assortativity
+  };
+}
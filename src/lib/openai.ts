@@ -0,0 +1,27 @@
+import type OpenAI from 'openai';
+import { REQUEST_TIMEOUTS } from './services';
+
+// Read once at module load alongside the client that uses it, so routes
+// check the key the client was actually built with
+const apiKey = process.env.OPENAI_API_KEY;
+export const openaiConfigured = !!apiKey;
+
+// One OpenAI client per server process, shared by the ML routes so their
+// requests reuse the client's connection pool instead of each route module
+// holding its own. The SDK is only loaded when a request first needs the
+// client, so cold starts and requests rejected before the model call don't
+// pay for it; a failed load is retried on the next call.
+let client: Promise<OpenAI> | null = null;
+
+export function getOpenAI(): Promise<OpenAI> {
+  return client ??= import('openai')
+    .then(({ default: OpenAI }) => new OpenAI({
+      apiKey,
+      timeout: REQUEST_TIMEOUTS.openai,
+      maxRetries: 2,
+    }))
+    .catch(error => {
+      client = null;
+      throw error;
+    });
+}
@@ -0,0 +1,19 @@
+// Pre-encoded JSON responses for static payloads.
+//
+// Catalog and workflow descriptions never change within a process, so they
+// are serialized once at module load; each response only splices the
+// current timestamp onto the end of the encoded object.
+
+import { NextResponse } from 'next/server';
+import { isoTimestamp } from './timestamp';
+
+const JSON_HEADERS = { 'Content-Type': 'application/json' };
+
+// `payload` must be a non-empty object; the returned function builds a
+// response equivalent to NextResponse.json({ ...payload, timestamp })
+export function preEncodedJson(payload: Record<string, unknown>) {
+  const prefix = JSON.stringify(payload).slice(0, -1);
+  return () => new NextResponse(`${prefix},"timestamp":${JSON.stringify(isoTimestamp())}}`, {
+    headers: JSON_HEADERS
+  });
+}
@@ -0,0 +1,53 @@
+// Clients for the backend services the API routes proxy to.
+//
+// Each client is created once per server process and shared by every route.
+// Node's fetch pools keep-alive connections per origin, so reusing one
+// client per backend keeps requests on warm connections instead of paying
+// connection setup on every call.
+
+// Per-call timeouts (ms) for outbound requests, kept in one place so every
+// route bounds the same kind of call the same way.
+export const REQUEST_TIMEOUTS = {
+  health: 5000,
+  centrality: 30000,
+  openai: 60000,
+};
+
+export interface ServiceRequestInit extends RequestInit {
+  // Overrides the client's default timeout; ignored when `signal` is given
+  timeout?: number;
+}
+
+export interface ServiceClient {
+  name: string;
+  baseUrl: string;
+  request(path: string, init?: ServiceRequestInit): Promise<Response>;
+}
+
+// Shared, never mutated: fetch copies request headers, so calls without
+// their own headers reuse this object instead of spreading a fresh one
+const DEFAULT_HEADERS: Readonly<Record<string, string>> = Object.freeze({
+  'Content-Type': 'application/json',
+});
+
+export function createServiceClient(name: string, baseUrl: string, defaultTimeout: number): ServiceClient {
+  const root = baseUrl.replace(/\/+$/, '');
+  return {
+    name,
+    baseUrl: root,
+    request(path, init = {}) {
+      const { timeout = defaultTimeout, ...rest } = init;
+      return fetch(`${root}${path}`, {
+        ...rest,
+        headers: rest.headers ? { ...DEFAULT_HEADERS, ...rest.headers } : DEFAULT_HEADERS,
+        signal: rest.signal ?? AbortSignal.timeout(timeout),
+      });
+    }
+  };
+}
+
+export const centralityService = createServiceClient(
+  'centrality',
+  process.env.CENTRALITY_SERVICE_URL || 'http://localhost:8001',
+  REQUEST_TIMEOUTS.centrality
+);
@@ -0,0 +1,5 @@
+// Cached ISO-8601 timestamp for response envelopes. The implementation is
+// CommonJS and lives beside the plain Node handlers in app/api/_shared, so
+// they and the app routes share one cache.
+
+export { isoTimestamp } from '@/app/api/_shared/timestamp';